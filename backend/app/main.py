@@ -49,29 +49,16 @@ Dashboard (3 endpoints):
 Total: 29 Endpoints
 =============================================================================
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import sys
-import os
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from cachetools import TTLCache
+import hashlib
+import re
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from routes.auth import router as auth_router
-from routes.projects import router as projects_router
-from routes.tasks import router as tasks_router
-from routes.roles import router as roles_router
-from routes.analytics import router as analytics_router
-from routes.dashboard import router as dashboard_router
-from utils.exceptions import (
-    ProjectNotFoundException, UnauthorizedAccessException,
-    InvalidDataException, DatabaseException, TaskNotFoundException,
-    TeamMemberNotFoundException, DuplicateEntryException,
-    MemberAlreadyExistsException, InvalidRoleException,
-    CannotRemoveOwnerException, UserNotFoundException,
-    InsufficientPermissionsException
-)
+from utils.exceptions import BaseAPIException
 
 # Create FastAPI application
 app = FastAPI(
@@ -79,29 +66,149 @@ app = FastAPI(
     description="A comprehensive project management API with authentication and Supabase integration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
+)
+
+# Response cache for idempotent GET endpoints
+# Paths whose JSON responses can be reused for a few seconds per user
+CACHEABLE_PATHS = (
+    re.compile(r"^/dashboard$"),
+    re.compile(r"^/dashboard/summary$"),
+    re.compile(r"^/projects$"),
+    re.compile(r"^/projects/[^/]+/stats$"),
 )
+_MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class CacheMiddleware:
+    """
+    Serve repeated GETs on CACHEABLE_PATHS from a short-TTL in-memory cache.
+    
+    Entries are scoped per user (hash of the Authorization header). Cached
+    lists and stats also reflect teammates' changes, so any mutating request,
+    from any user, bumps a shared version that invalidates every cached
+    response in this process at once. Other worker processes keep their own
+    cache and may serve a response for up to ttl seconds after a write.
+    
+    Pure ASGI (not BaseHTTPMiddleware): every response leaves as a single
+    body message with its Content-Length, so GZipMiddleware outside it can
+    apply minimum_size instead of compressing a stream of unknown length.
+    """
+    
+    def __init__(self, app, maxsize: int = 2000, ttl: int = 3):
+        self.app = app
+        self.responses: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.version = 0
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        if method in _MUTATING_METHODS:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.version += 1
+            return
+        
+        path = scope["path"]
+        authorization = Headers(scope=scope).get("authorization")
+        if (
+            method != "GET"
+            or not authorization
+            or not any(pattern.match(path) for pattern in CACHEABLE_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        user_key = hashlib.sha256(authorization.encode()).digest()[:16]
+        # A GET that overlaps a write is stored under the version it started
+        # with, so its (possibly stale) body is never served afterwards
+        cache_key = (user_key, self.version, path, scope["query_string"])
+        body = self.responses.get(cache_key)
+        if body is not None:
+            await Response(content=body, media_type="application/json")(scope, receive, send)
+            return
+        
+        # Buffer the response, then send it once with an exact Content-Length
+        start = None
+        chunks = []
+        
+        async def buffer(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        await self.app(scope, receive, buffer)
+        
+        body = b"".join(chunks)
+        if start["status"] == 200:
+            self.responses[cache_key] = body
+        
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        headers["content-length"] = str(len(body))
+        await send({**start, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
+
+
+# Fresh request-scoped lookup cache (roles, projects) for every request
+from utils.request_cache import RequestCacheMiddleware
+app.add_middleware(RequestCacheMiddleware)
+
+# Added before CORS so it runs inside it (cached responses still get CORS headers)
+app.add_middleware(CacheMiddleware)
+
+# Compress large JSON bodies (project lists, dashboard, analytics) for
+# clients that accept gzip. Outside the response cache so it stores plain bodies.
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # CORS Configuration
 # Configure CORS to allow requests from React frontend
-from utils.config import CORS_ORIGINS
-origins = CORS_ORIGINS
+from utils.config import CORS_ORIGINS_SET, DEBUG
+origins = CORS_ORIGINS_SET
+
+# Explicit methods/headers used by the frontend (lets Starlette precompute
+# the preflight response instead of echoing wildcard requests)
+_ALLOWED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+_ALLOWED_HEADERS = ("authorization", "content-type", "accept", "if-none-match")
+# Readable by cross-origin JavaScript (conditional GETs need the ETag)
+_EXPOSED_HEADERS = ("ETag",)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,  # List of allowed origins
+    allow_origins=origins,  # Set of allowed origins (hashed lookup)
     allow_credentials=True,  # Allow cookies and authorization headers
-    allow_methods=["*"],  # Allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
-    allow_headers=["*"],  # Allow all headers
+    allow_methods=_ALLOWED_METHODS,
+    allow_headers=_ALLOWED_HEADERS,
+    expose_headers=_EXPOSED_HEADERS,
 )
 
-# Register routers
-app.include_router(auth_router)
-app.include_router(projects_router)
-app.include_router(tasks_router)
-app.include_router(roles_router)
-app.include_router(analytics_router)
-app.include_router(dashboard_router)
+
+def _register_routers(app: FastAPI) -> None:
+    """
+    Import and register all route modules.
+    
+    Route modules pull in the Supabase client and all Pydantic models, so
+    they are imported here (at startup) rather than when main.py is loaded.
+    """
+    from routes.auth import router as auth_router
+    from routes.projects import router as projects_router
+    from routes.tasks import router as tasks_router
+    from routes.roles import router as roles_router
+    from routes.analytics import router as analytics_router
+    from routes.dashboard import router as dashboard_router
+    
+    app.include_router(auth_router)
+    app.include_router(projects_router)
+    app.include_router(tasks_router)
+    app.include_router(roles_router)
+    app.include_router(analytics_router)
+    app.include_router(dashboard_router)
 
 # Root endpoint
 @app.get("/")
@@ -124,110 +231,13 @@ async def health_check():
         "version": "1.0.0"
     }
 
-# Custom exception handlers
-@app.exception_handler(ProjectNotFoundException)
-async def project_not_found_handler(request, exc):
-    """Handle project not found exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(UnauthorizedAccessException)
-async def unauthorized_access_handler(request, exc):
-    """Handle unauthorized access exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(InvalidDataException)
-async def invalid_data_handler(request, exc):
-    """Handle invalid data exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(DatabaseException)
-async def database_exception_handler(request, exc):
-    """Handle database exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(TaskNotFoundException)
-async def task_not_found_handler(request, exc):
-    """Handle task not found exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(TeamMemberNotFoundException)
-async def team_member_not_found_handler(request, exc):
-    """Handle team member not found exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(DuplicateEntryException)
-async def duplicate_entry_handler(request, exc):
-    """Handle duplicate entry exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(MemberAlreadyExistsException)
-async def member_already_exists_handler(request, exc):
-    """Handle member already exists exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(InvalidRoleException)
-async def invalid_role_handler(request, exc):
-    """Handle invalid role exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(CannotRemoveOwnerException)
-async def cannot_remove_owner_handler(request, exc):
-    """Handle cannot remove owner exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(UserNotFoundException)
-async def user_not_found_handler(request, exc):
-    """Handle user not found exceptions."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"detail": exc.detail}
-    )
-
-
-@app.exception_handler(InsufficientPermissionsException)
-async def insufficient_permissions_handler(request, exc):
-    """Handle insufficient permissions exceptions."""
-    return JSONResponse(
+# Custom exception handler
+# All application exceptions derive from BaseAPIException, so a single
+# handler covers them (Starlette resolves handlers along the class MRO)
+@app.exception_handler(BaseAPIException)
+async def api_exception_handler(request, exc):
+    """Handle application-defined API exceptions."""
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
@@ -238,7 +248,7 @@ async def insufficient_permissions_handler(request, exc):
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
     print(f"Unhandled exception: {type(exc).__name__}: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
@@ -250,30 +260,34 @@ async def global_exception_handler(request, exc):
 @app.on_event("startup")
 async def startup_event():
     """Run tasks on application startup."""
-    from utils.logger import log_startup
+    _register_routers(app)
+    
+    from utils.config import init_http_pool
+    app.state.http_client = init_http_pool()
+    
+    from utils.logger import log_startup, get_logger
     log_startup()
-    print("=" * 80)
-    print("🚀 PROJECT MANAGEMENT API - READY")
-    print("=" * 80)
-    print("📚 API Documentation: http://localhost:8000/docs")
-    print("🔄 ReDoc Documentation: http://localhost:8000/redoc")
-    print("=" * 80)
-    print("📊 Total Endpoints: 29")
-    print("  - Authentication: 5")
-    print("  - Projects: 6")
-    print("  - Tasks: 6")
-    print("  - Team Members: 6")
-    print("  - Analytics: 3")
-    print("  - Dashboard: 3")
-    print("=" * 80)
+    if DEBUG:
+        get_logger('app').info(
+            "Project Management API ready\n"
+            "  API Documentation: /docs (ReDoc: /redoc)\n"
+            "  Total Endpoints: 29 (Authentication 5, Projects 6, Tasks 6, "
+            "Team Members 6, Analytics 3, Dashboard 3)"
+        )
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run tasks on application shutdown."""
+    from utils.supabase_client import shutdown_db_executor
+    shutdown_db_executor()
+    
+    from utils.config import close_http_pool
+    close_http_pool()
+    
+    from utils.cache import close_cache
+    await close_cache()
+    
     from utils.logger import log_shutdown
     log_shutdown()
-    print("=" * 80)
-    print("👋 Project Management API - Shutdown Complete")
-    print("=" * 80)
 
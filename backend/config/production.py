@@ -259,10 +259,10 @@ def validate_config():
     if not SUPABASE_URL.startswith("https://"):
         raise ValueError("SUPABASE_URL must use HTTPS in production")
     
-    # Validate CORS origins
-    for origin in CORS_ORIGINS:
-        if not origin.startswith("https://"):
-            raise ValueError(f"CORS origin must use HTTPS in production: {origin}")
+    # Validate CORS origins (stops at the first non-HTTPS origin)
+    insecure_origin = next((origin for origin in CORS_ORIGINS if not origin.startswith("https://")), None)
+    if insecure_origin is not None:
+        raise ValueError(f"CORS origin must use HTTPS in production: {insecure_origin}")
 
 # Run validation on import
 validate_config()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Convert the JSON Lines test report into a single JSON array
+(the format test_endpoints.py used to write as test_report.json)
+"""
+
+import argparse
+
+import orjson
+
+
+def convert(source: str, target: str):
+    """Read one result per line from source and write them as an indented JSON array"""
+    with open(source, "rb") as f:
+        results = [orjson.loads(line) for line in f if line.strip()]
+    
+    with open(target, "wb") as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    
+    print(f"Wrote {len(results)} results to {target}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Convert test_report.jsonl to a JSON array")
+    parser.add_argument("source", nargs="?", default="test_report.jsonl", help="JSON Lines report")
+    parser.add_argument("target", nargs="?", default="test_report.json", help="JSON array output")
+    
+    args = parser.parse_args()
+    convert(args.source, args.target)
+
+if __name__ == "__main__":
+    main()
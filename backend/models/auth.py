@@ -1,21 +1,52 @@
 """
 Authentication models and in-memory user storage.
 """
-from datetime import datetime
-from typing import Optional, Dict, List
-from pydantic import BaseModel, EmailStr, Field
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Set
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+# Argon2id hasher for stored passwords (cost parameters per the OWASP baseline)
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Number of username -> id shards (power of two so the index is a bit mask)
+USERNAME_SHARDS = 16
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def utc_now() -> datetime:
+    """Return the current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def _check_email(value: str) -> str:
+    """Validate email format with a single precompiled regex match."""
+    if not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    return value
 
 
 class User(BaseModel):
     """User model for authentication."""
     id: str
     username: str
-    password: str  # Plain text for simplicity (not recommended for production)
-    email: EmailStr
-    created_at: datetime = Field(default_factory=datetime.now)
+    password: str  # Argon2 hash (see hash_password), never the plain text
+    email: str
+    created_at: datetime = Field(default_factory=utc_now)
+    
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        """Validate email format."""
+        return _check_email(value)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "user_123",
                 "username": "johndoe",
@@ -24,22 +55,30 @@ class User(BaseModel):
                 "created_at": "2024-01-01T00:00:00"
             }
         }
+    )
 
 
 class UserSignup(BaseModel):
     """Model for user signup requests."""
     username: str = Field(..., min_length=3, max_length=50)
     password: str = Field(..., min_length=6)
-    email: EmailStr
+    email: str
+    
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        """Validate email format."""
+        return _check_email(value)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "johndoe",
                 "password": "password123",
                 "email": "johndoe@example.com"
             }
         }
+    )
 
 
 class UserLogin(BaseModel):
@@ -47,13 +86,14 @@ class UserLogin(BaseModel):
     username: str
     password: str
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "johndoe",
                 "password": "password123"
             }
         }
+    )
 
 
 class UserResponse(BaseModel):
@@ -63,8 +103,9 @@ class UserResponse(BaseModel):
     email: str
     created_at: datetime
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "user_123",
                 "username": "johndoe",
@@ -72,6 +113,7 @@ class UserResponse(BaseModel):
                 "created_at": "2024-01-01T00:00:00"
             }
         }
+    )
 
 
 class TokenResponse(BaseModel):
@@ -79,8 +121,8 @@ class TokenResponse(BaseModel):
     token: str
     user: UserResponse
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "token": "abc123xyz789",
                 "user": {
@@ -91,6 +133,11 @@ class TokenResponse(BaseModel):
                 }
             }
         }
+    )
+
+
+# Prebuilt serializer for the auth endpoints (routes return its JSON bytes directly)
+TOKEN_RESPONSE_ADAPTER = TypeAdapter(TokenResponse)
 
 
 # In-memory storage for users and tokens
@@ -99,53 +146,131 @@ class InMemoryStorage:
     """In-memory storage for users and authentication tokens."""
     
     def __init__(self):
-        self.users: Dict[str, User] = {}  # username -> User
-        self.tokens: Dict[str, str] = {}  # token -> username
-        self.user_ids: Dict[str, User] = {}  # user_id -> User
+        self.users_by_id: Dict[str, User] = {}  # user_id -> User
+        # username -> user_id, split across shards keyed by hash(username)
+        self.username_shards: List[Dict[str, str]] = [{} for _ in range(USERNAME_SHARDS)]
+        self.password_hashes: Dict[str, str] = {}  # username -> argon2 hash (authoritative)
+        # Tokens are stored only as digests, mapped straight to their user
+        self.tokens: Dict[bytes, User] = {}  # blake2b(token) -> User
+        self.user_tokens: Dict[str, Set[bytes]] = {}  # username -> token digests
+        self.emails: Set[str] = set()  # lowercased emails
+    
+    @staticmethod
+    def _token_key(token: str) -> bytes:
+        """Build the storage key for a token (16-byte BLAKE2b digest)."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    def _shard(self, username: str) -> Dict[str, str]:
+        """Return the username -> id shard holding a username."""
+        return self.username_shards[hash(username) & (USERNAME_SHARDS - 1)]
     
     def add_user(self, user: User) -> None:
         """Add a user to storage."""
-        self.users[user.username] = user
-        self.user_ids[user.id] = user
+        self.users_by_id[user.id] = user
+        self._shard(user.username)[user.username] = user.id
+        self.password_hashes[user.username] = user.password
+        self.emails.add(user.email.lower())
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
-        return self.users.get(username)
+        user_id = self._shard(username).get(username)
+        return self.users_by_id.get(user_id) if user_id else None
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
-        return self.user_ids.get(user_id)
+        return self.users_by_id.get(user_id)
     
     def username_exists(self, username: str) -> bool:
         """Check if username already exists."""
-        return username in self.users
+        return username in self._shard(username)
     
     def email_exists(self, email: str) -> bool:
         """Check if email already exists."""
-        return any(user.email == email for user in self.users.values())
+        return email.lower() in self.emails
+    
+    def check_password(self, username: str, password: str) -> bool:
+        """
+        Check a password against the stored argon2 hash.
+        
+        Hashes made with older cost parameters are upgraded on a
+        successful check, so the expensive rehash happens only once.
+        """
+        password_hash = self.password_hashes.get(username)
+        if password_hash is None:
+            return False
+        
+        try:
+            _password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        
+        if _password_hasher.check_needs_rehash(password_hash):
+            self.password_hashes[username] = _password_hasher.hash(password)
+        return True
     
     def add_token(self, token: str, username: str) -> None:
         """Add a token for a user."""
-        self.tokens[token] = username
+        user = self.get_user_by_username(username)
+        if user is None:
+            return
+        key = self._token_key(token)
+        self.tokens[key] = user
+        self.user_tokens.setdefault(username, set()).add(key)
     
     def get_username_by_token(self, token: str) -> Optional[str]:
         """Get username by token."""
-        return self.tokens.get(token)
+        user = self.tokens.get(self._token_key(token))
+        return user.username if user else None
+    
+    def get_user_by_token(self, token: str) -> Optional[User]:
+        """Get the user owning a token (a single digest lookup)."""
+        return self.tokens.get(self._token_key(token))
     
     def remove_token(self, token: str) -> bool:
         """Remove a token (logout)."""
-        if token in self.tokens:
-            del self.tokens[token]
-            return True
-        return False
+        key = self._token_key(token)
+        user = self.tokens.pop(key, None)
+        if user is None:
+            return False
+        
+        user_tokens = self.user_tokens.get(user.username)
+        if user_tokens is not None:
+            user_tokens.discard(key)
+            if not user_tokens:
+                del self.user_tokens[user.username]
+        return True
+    
+    def get_user_tokens(self, username: str) -> Set[bytes]:
+        """Get the digests of all active tokens (sessions) of a user."""
+        return set(self.user_tokens.get(username, ()))
+    
+    def revoke_all(self, username: str) -> int:
+        """
+        Remove every token of a user (logout from all sessions).
+        
+        Args:
+            username: Username whose tokens are revoked
+            
+        Returns:
+            Number of tokens removed
+        """
+        user_tokens = self.user_tokens.pop(username, set())
+        for key in user_tokens:
+            self.tokens.pop(key, None)
+        return len(user_tokens)
     
     def token_exists(self, token: str) -> bool:
         """Check if token exists."""
-        return token in self.tokens
+        return self._token_key(token) in self.tokens
     
     def get_all_users(self) -> List[User]:
         """Get all users."""
-        return list(self.users.values())
+        return list(self.users_by_id.values())
+
+
+def hash_password(password: str) -> str:
+    """Hash a password for storage (argon2id, salted, PHC string format)."""
+    return _password_hasher.hash(password)
 
 
 # Global storage instance
@@ -2,19 +2,19 @@
 Project-related models and schemas.
 """
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, validator
-from enum import Enum
+from typing import Dict, Optional, List
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from enum import StrEnum
 
 
-class ProjectStatus(str, Enum):
+class ProjectStatus(StrEnum):
     """Project status enum."""
     ACTIVE = "active"
     COMPLETED = "completed"
     ON_HOLD = "on_hold"
 
 
-class TeamMemberRole(str, Enum):
+class TeamMemberRole(StrEnum):
     """Team member role enum."""
     OWNER = "owner"
     MANAGER = "manager"
@@ -29,8 +29,8 @@ class ProjectCreate(BaseModel):
     status: ProjectStatus = ProjectStatus.ACTIVE
     progress: int = Field(default=0, ge=0, le=100)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Website Redesign",
                 "description": "Complete redesign of company website",
@@ -38,6 +38,7 @@ class ProjectCreate(BaseModel):
                 "progress": 0
             }
         }
+    )
 
 
 class ProjectUpdate(BaseModel):
@@ -47,8 +48,8 @@ class ProjectUpdate(BaseModel):
     status: Optional[ProjectStatus] = None
     progress: Optional[int] = Field(None, ge=0, le=100)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Website Redesign v2",
                 "description": "Updated description",
@@ -56,6 +57,7 @@ class ProjectUpdate(BaseModel):
                 "progress": 45
             }
         }
+    )
 
 
 class Project(BaseModel):
@@ -69,8 +71,9 @@ class Project(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "name": "Website Redesign",
@@ -82,6 +85,7 @@ class Project(BaseModel):
                 "updated_at": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class TeamMember(BaseModel):
@@ -92,8 +96,9 @@ class TeamMember(BaseModel):
     role: str
     assigned_at: datetime
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174001",
                 "project_id": "123e4567-e89b-12d3-a456-426614174000",
@@ -102,6 +107,7 @@ class TeamMember(BaseModel):
                 "assigned_at": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class TeamMemberAdd(BaseModel):
@@ -109,21 +115,47 @@ class TeamMemberAdd(BaseModel):
     username: str = Field(..., min_length=1)
     role: TeamMemberRole = TeamMemberRole.DEVELOPER
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "john_doe",
                 "role": "developer"
             }
         }
+    )
+
+
+class TeamMemberListResponse(BaseModel):
+    """Model for team members together with their role permissions."""
+    members: List[TeamMember]
+    permissions: Dict[str, List[str]]
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "members": [
+                    {
+                        "id": "123e4567-e89b-12d3-a456-426614174001",
+                        "project_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "username": "john_doe",
+                        "role": "viewer",
+                        "assigned_at": "2024-01-01T00:00:00Z"
+                    }
+                ],
+                "permissions": {
+                    "john_doe": ["view_project", "view_task"]
+                }
+            }
+        }
+    )
 
 
 class ProjectWithTeam(Project):
     """Model for project with team members."""
     team_members: List[TeamMember] = []
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "name": "Website Redesign",
@@ -144,6 +176,7 @@ class ProjectWithTeam(Project):
                 ]
             }
         }
+    )
 
 
 class ProjectListResponse(BaseModel):
@@ -151,8 +184,8 @@ class ProjectListResponse(BaseModel):
     projects: List[ProjectWithTeam]
     total: int
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "projects": [
                     {
@@ -170,16 +203,17 @@ class ProjectListResponse(BaseModel):
                 "total": 1
             }
         }
+    )
 
 
-class TaskStatus(str, Enum):
+class TaskStatus(StrEnum):
     """Task status enum."""
     TODO = "todo"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
 
 
-class TaskPriority(str, Enum):
+class TaskPriority(StrEnum):
     """Task priority enum."""
     LOW = "low"
     MEDIUM = "medium"
@@ -195,8 +229,8 @@ class TaskCreate(BaseModel):
     status: TaskStatus = TaskStatus.TODO
     priority: TaskPriority = TaskPriority.MEDIUM
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "project_id": "123e4567-e89b-12d3-a456-426614174000",
                 "title": "Design homepage mockup",
@@ -206,6 +240,7 @@ class TaskCreate(BaseModel):
                 "priority": "high"
             }
         }
+    )
 
 
 class TaskUpdate(BaseModel):
@@ -215,29 +250,34 @@ class TaskUpdate(BaseModel):
     assigned_to: Optional[str] = None
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
+    # Optimistic concurrency: the task's updated_at as last read by the client
+    if_unmodified_since: Optional[datetime] = None
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "Updated task title",
                 "description": "Updated description",
                 "assigned_to": "jane_doe",
                 "status": "in_progress",
-                "priority": "high"
+                "priority": "high",
+                "if_unmodified_since": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class TaskStatusUpdate(BaseModel):
     """Model for updating only task status."""
     status: TaskStatus
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "in_progress"
             }
         }
+    )
 
 
 class Task(BaseModel):
@@ -252,8 +292,9 @@ class Task(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174002",
                 "project_id": "123e4567-e89b-12d3-a456-426614174000",
@@ -266,6 +307,7 @@ class Task(BaseModel):
                 "updated_at": "2024-01-01T00:00:00Z"
             }
         }
+    )
 
 
 class TaskListResponse(BaseModel):
@@ -273,8 +315,8 @@ class TaskListResponse(BaseModel):
     tasks: List[Task]
     total: int
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "tasks": [
                     {
@@ -292,4 +334,11 @@ class TaskListResponse(BaseModel):
                 "total": 1
             }
         }
+    )
+
 
+# Prebuilt serializers for the list endpoints (routes return their JSON bytes directly)
+PROJECT_LIST_ADAPTER = TypeAdapter(ProjectListResponse)
+TASK_LIST_ADAPTER = TypeAdapter(TaskListResponse)
+TEAM_MEMBER_LIST_ADAPTER = TypeAdapter(List[TeamMember])
+TEAM_MEMBER_PERMISSIONS_ADAPTER = TypeAdapter(TeamMemberListResponse)
@@ -1,19 +1,21 @@
 """
 Analytics API routes for project metrics and insights.
 """
+import asyncio
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 
 from models.auth import User
 from utils.middleware import get_current_user
-from utils.supabase_client import get_db, SupabaseDB
-from utils.permissions import get_user_role_in_project, check_permission, Permission
+from utils.permissions import (
+    get_user_role_in_project, get_project_cached, check_permission, Permission
+)
 from utils.exceptions import (
     ProjectNotFoundException, UnauthorizedAccessException,
     InsufficientPermissionsException
 )
 from utils.analytics import (
-    calculate_task_completion_rate, get_tasks_by_priority,
-    get_team_productivity, get_project_timeline, get_member_analytics
+    get_project_counts, get_team_productivity, get_project_timeline, get_member_analytics
 )
 
 
@@ -29,31 +31,34 @@ router = APIRouter(
 )
 
 
-async def verify_analytics_access(project_id: str, username: str) -> None:
+async def verify_analytics_access(project_id: str, current_user: User) -> dict:
     """
     Verify user has access to analytics (owner or manager).
     
     Args:
         project_id: Project UUID
-        username: Username to check
+        current_user: Authenticated user (already resolved for this request)
+        
+    Returns:
+        Project dictionary
         
     Raises:
         ProjectNotFoundException: If project doesn't exist
         InsufficientPermissionsException: If user lacks permission
     """
-    db: SupabaseDB = get_db()
-    
     # Check if project exists
-    project = await db.select_by_id("projects", project_id)
+    project = await get_project_cached(project_id)
     if not project:
         raise ProjectNotFoundException(project_id)
     
     # Get user's role
-    user_role = await get_user_role_in_project(username, project_id)
+    user_role = await get_user_role_in_project(current_user.username, project_id)
     
     # Check if user has VIEW_ANALYTICS permission
     if not check_permission(user_role, Permission.VIEW_ANALYTICS):
         raise InsufficientPermissionsException("view analytics (owner or manager only)")
+    
+    return project
 
 
 @router.get("")
@@ -72,44 +77,43 @@ async def get_project_analytics(
     
     Only accessible to project owners and managers.
     """
-    # Verify access
-    await verify_analytics_access(project_id, current_user.username)
-    
-    db: SupabaseDB = get_db()
-    
-    # Get project details
-    project = await db.select_by_id("projects", project_id)
-    
-    # Get task completion rate
-    task_completion = await calculate_task_completion_rate(project_id)
-    
-    # Get tasks by priority
-    tasks_by_priority = await get_tasks_by_priority(project_id)
-    
-    # Get team size
-    team_members = await db.select_where("team_members", "project_id", project_id)
-    team_size = len(team_members) + 1  # +1 for owner
-    
-    # Get team productivity
-    team_productivity = await get_team_productivity(project_id)
-    
-    return {
+    # Verify access (returns the already-loaded project)
+    project = await verify_analytics_access(project_id, current_user)
+    
+    # Status/priority/member counts come from one aggregate query;
+    # team productivity is fetched concurrently
+    project_counts, team_productivity = await asyncio.gather(
+        get_project_counts([project_id]),
+        get_team_productivity(project_id)
+    )
+    counts = project_counts.get(project_id, {})
+    
+    todo_tasks = counts.get("todo", 0)
+    in_progress_tasks = counts.get("in_progress", 0)
+    completed_tasks = counts.get("completed", 0)
+    
+    # Plain JSON data: serialize directly with orjson, skipping jsonable_encoder
+    return ORJSONResponse({
         "project_id": project_id,
         "project_name": project.get("name"),
-        "total_tasks": task_completion["total_tasks"],
-        "completed_tasks": task_completion["completed_tasks"],
-        "in_progress_tasks": task_completion["in_progress_tasks"],
-        "todo_tasks": task_completion["todo_tasks"],
+        "total_tasks": counts.get("task_count", 0),
+        "completed_tasks": completed_tasks,
+        "in_progress_tasks": in_progress_tasks,
+        "todo_tasks": todo_tasks,
         "overall_progress": project.get("progress", 0),
-        "team_size": team_size,
-        "tasks_by_priority": tasks_by_priority,
+        "team_size": counts.get("member_count", 0) + 1,  # +1 for owner
+        "tasks_by_priority": {
+            "high": counts.get("high", 0),
+            "medium": counts.get("medium", 0),
+            "low": counts.get("low", 0)
+        },
         "tasks_by_status": {
-            "todo": task_completion["todo_tasks"],
-            "in_progress": task_completion["in_progress_tasks"],
-            "completed": task_completion["completed_tasks"]
+            "todo": todo_tasks,
+            "in_progress": in_progress_tasks,
+            "completed": completed_tasks
         },
         "team_productivity": team_productivity
-    }
+    })
 
 
 @router.get("/timeline")
@@ -129,12 +133,12 @@ async def get_analytics_timeline(
     Only accessible to project owners and managers.
     """
     # Verify access
-    await verify_analytics_access(project_id, current_user.username)
+    await verify_analytics_access(project_id, current_user)
     
     # Get timeline data
     timeline = await get_project_timeline(project_id, days)
     
-    return timeline
+    return ORJSONResponse(timeline)
 
 
 @router.get("/member/{username}")
@@ -156,10 +160,8 @@ async def get_member_analytics_endpoint(
     - Managers
     - The member themselves
     """
-    db: SupabaseDB = get_db()
-    
     # Check if project exists
-    project = await db.select_by_id("projects", project_id)
+    project = await get_project_cached(project_id)
     if not project:
         raise ProjectNotFoundException(project_id)
     
@@ -178,5 +180,5 @@ async def get_member_analytics_endpoint(
     # Get member analytics
     analytics = await get_member_analytics(project_id, username)
     
-    return analytics
+    return ORJSONResponse(analytics)
 
@@ -1,10 +1,13 @@
 """
 Authentication API routes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import Dict
 
-from models.auth import UserSignup, UserLogin, TokenResponse, UserResponse
+from models.auth import (
+    UserSignup, UserLogin, TokenResponse, UserResponse, TOKEN_RESPONSE_ADAPTER
+)
 from utils.supabase_auth import signup, login, logout, verify_token
 from utils.middleware import get_token_from_header, verify_auth_token
 
@@ -30,7 +33,7 @@ async def signup_endpoint(signup_data: UserSignup):
     
     Returns authentication token and user information.
     """
-    success, message, token_response = signup(signup_data)
+    success, message, token_response = await asyncio.to_thread(signup, signup_data)
     
     if not success:
         raise HTTPException(
@@ -38,7 +41,11 @@ async def signup_endpoint(signup_data: UserSignup):
             detail=message
         )
     
-    return token_response
+    return Response(
+        content=TOKEN_RESPONSE_ADAPTER.dump_json(token_response),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json"
+    )
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -51,7 +58,7 @@ async def login_endpoint(login_data: UserLogin):
     
     Returns authentication token and user information.
     """
-    success, message, token_response = login(login_data)
+    success, message, token_response = await asyncio.to_thread(login, login_data)
     
     if not success:
         raise HTTPException(
@@ -59,7 +66,10 @@ async def login_endpoint(login_data: UserLogin):
             detail=message
         )
     
-    return token_response
+    return Response(
+        content=TOKEN_RESPONSE_ADAPTER.dump_json(token_response),
+        media_type="application/json"
+    )
 
 
 @router.post("/logout")
@@ -69,7 +79,7 @@ async def logout_endpoint(token: str = Depends(get_token_from_header)) -> Dict[s
     
     Requires valid authentication token in Authorization header.
     """
-    success, message = logout(token)
+    success, message = await asyncio.to_thread(logout, token)
     
     if not success:
         raise HTTPException(
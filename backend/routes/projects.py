@@ -1,19 +1,26 @@
 """
 Project management API routes.
 """
-from fastapi import APIRouter, Depends, status
+from collections import defaultdict
+from fastapi import APIRouter, Depends, Response, status
 from typing import List
 
 from models.auth import User, UserResponse
 from models.project import (
     Project, ProjectCreate, ProjectUpdate, ProjectWithTeam,
-    ProjectListResponse, TeamMember, TeamMemberAdd
+    ProjectListResponse, TeamMember, TeamMemberAdd, PROJECT_LIST_ADAPTER,
+    TEAM_MEMBER_LIST_ADAPTER
 )
 from utils.middleware import get_current_user, verify_auth_token
 from utils.supabase_client import get_db, SupabaseDB
+from utils.analytics import get_project_counts
+from utils.cache import invalidate_project
+from utils import analytics_cache
+from utils.permissions import get_user_projects, get_project_context
 from utils.exceptions import (
     ProjectNotFoundException, UnauthorizedAccessException,
-    InvalidDataException, DatabaseException
+    InvalidDataException, DatabaseException,
+    DuplicateEntryException, MemberAlreadyExistsException
 )
 
 
@@ -51,8 +58,9 @@ async def check_project_access(
         ProjectNotFoundException: If project doesn't exist
         UnauthorizedAccessException: If user doesn't have access
     """
-    # Get project
-    project = await db.select_by_id("projects", project_id)
+    # Get project and the user's role in one query (shared with later
+    # lookups in this request)
+    project, role = await get_project_context(project_id, username)
     
     if not project:
         raise ProjectNotFoundException(project_id)
@@ -64,12 +72,8 @@ async def check_project_access(
         raise UnauthorizedAccessException("Only project owner can perform this action")
     
     # Check if user has access (owner or team member)
-    if not is_owner:
-        team_members = await db.select_where("team_members", "project_id", project_id)
-        is_team_member = any(tm["username"] == username for tm in team_members)
-        
-        if not is_team_member:
-            raise UnauthorizedAccessException("You don't have access to this project")
+    if role is None:
+        raise UnauthorizedAccessException("You don't have access to this project")
     
     return project
 
@@ -112,54 +116,32 @@ async def get_all_projects(
     - The project owner
     - A team member
     
-    Each project includes its team members and the authenticated user's role in the project.
+    Each project includes its team members.
     """
-    from utils.permissions import get_user_role_in_project
-    
     db = get_db()
     
-    # Get projects owned by user
-    owned_projects = await db.select_where("projects", "owner_id", current_user.username)
-    
-    # Get projects where user is a team member
-    team_memberships = await db.select_where("team_members", "username", current_user.username)
-    team_project_ids = [tm["project_id"] for tm in team_memberships]
-    
-    # Get team projects
-    team_projects = []
-    for project_id in team_project_ids:
-        project = await db.select_by_id("projects", project_id)
-        if project:
-            team_projects.append(project)
-    
-    # Combine all projects (remove duplicates)
-    all_projects = owned_projects + team_projects
-    seen_ids = set()
-    unique_projects = []
-    for project in all_projects:
-        if project["id"] not in seen_ids:
-            seen_ids.add(project["id"])
-            unique_projects.append(project)
-    
-    # Add team members and user role to each project
-    projects_with_teams = []
-    for project in unique_projects:
-        team_members = await db.select_where("team_members", "project_id", project["id"])
-        
-        # Get current user's role in this project
-        user_role = await get_user_role_in_project(current_user.username, project["id"])
-        
-        # Create project with additional info
-        project_data = {**project, "user_role": user_role}
-        project_with_team = ProjectWithTeam(
-            **project,
-            team_members=[TeamMember(**tm) for tm in team_members]
-        )
-        projects_with_teams.append(project_with_team)
+    # Owned and team projects in a single query (already de-duplicated)
+    unique_projects = await get_user_projects(current_user.username)
     
-    return ProjectListResponse(
-        projects=projects_with_teams,
-        total=len(projects_with_teams)
+    # Fetch team members for all projects at once and group them by project
+    all_members = await db.select_in(
+        "team_members", "project_id", [project["id"] for project in unique_projects]
+    )
+    members_by_project = defaultdict(list)
+    for tm in all_members:
+        members_by_project[tm["project_id"]].append(tm)
+    
+    # Validate the whole response in one pydantic-core call instead of per row
+    project_list = PROJECT_LIST_ADAPTER.validate_python({
+        "projects": [
+            {**project, "team_members": members_by_project[project["id"]]}
+            for project in unique_projects
+        ],
+        "total": len(unique_projects)
+    })
+    return Response(
+        content=PROJECT_LIST_ADAPTER.dump_json(project_list),
+        media_type="application/json"
     )
 
 
@@ -173,30 +155,19 @@ async def get_project(
     
     Returns full project details including:
     - All team members and their roles
-    - Authenticated user's role in the project
     
     User must be either the project owner or a team member.
     """
-    from utils.permissions import get_user_role_in_project
-    
     db = get_db()
     
-    # Check access
+    # Check access (returns the project, so it is not fetched again)
     project = await check_project_access(project_id, current_user.username, db)
     
     # Get team members
     team_members = await db.select_where("team_members", "project_id", project_id)
     
-    # Get current user's role
-    user_role = await get_user_role_in_project(current_user.username, project_id)
-    
-    # Add user role to response (could extend ProjectWithTeam model to include this)
-    project_with_role = {**project, "user_role": user_role}
-    
-    return ProjectWithTeam(
-        **project,
-        team_members=[TeamMember(**tm) for tm in team_members]
-    )
+    # response_model validates the payload once; building models here would validate twice
+    return {**project, "team_members": team_members}
 
 
 @router.put("/{project_id}", response_model=Project)
@@ -230,6 +201,8 @@ async def update_project(
     
     # Update project
     updated_project = await db.update("projects", project_id, update_data)
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
     return Project(**updated_project)
 
@@ -255,6 +228,8 @@ async def delete_project(
     
     # Delete project (CASCADE will handle related records)
     await db.delete("projects", project_id)
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
     return None
 
@@ -295,10 +270,69 @@ async def add_team_member(
     }
     
     created_member = await db.insert("team_members", member_data)
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
     return TeamMember(**created_member)
 
 
+@router.post("/{project_id}/team/bulk", response_model=List[TeamMember], status_code=status.HTTP_201_CREATED)
+async def add_team_members_bulk(
+    project_id: str,
+    team_members: List[TeamMemberAdd],
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Add several team members to a project in one request.
+    
+    Only the project owner can add team members.
+    Nobody is added if any of the users is already a team member.
+    
+    Body: list of `{"username": ..., "role": ...}` objects
+    """
+    db = get_db()
+    
+    # Check owner access
+    await check_project_access(project_id, current_user.username, db, require_owner=True)
+    
+    if not team_members:
+        raise InvalidDataException("No team members provided")
+    
+    usernames = [tm.username for tm in team_members]
+    if len(set(usernames)) != len(usernames):
+        raise InvalidDataException("Each username can only be added once")
+    
+    # Check all users against existing team members with one query
+    existing = await db.select_in(
+        "team_members", "username", usernames,
+        columns="username", filters={"project_id": project_id}
+    )
+    
+    if existing:
+        raise MemberAlreadyExistsException(existing[0]["username"])
+    
+    # Add all team members with a single insert
+    try:
+        created_members = await db.insert_many("team_members", [
+            {"project_id": project_id, "username": tm.username, "role": tm.role}
+            for tm in team_members
+        ])
+    except DuplicateEntryException:
+        # A concurrent request added one of these users after the check above;
+        # UNIQUE(project_id, username) rejected the whole insert
+        existing = await db.select_in(
+            "team_members", "username", usernames,
+            columns="username", filters={"project_id": project_id}
+        )
+        if existing:
+            raise MemberAlreadyExistsException(existing[0]["username"])
+        raise
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
+    
+    return created_members
+
+
 @router.delete("/{project_id}/team/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_team_member(
     project_id: str,
@@ -317,6 +351,8 @@ async def remove_team_member(
     
     # Delete team member
     await db.delete("team_members", member_id)
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
     return None
 
@@ -339,7 +375,11 @@ async def get_team_members(
     # Get team members
     team_members = await db.select_where("team_members", "project_id", project_id)
     
-    return [TeamMember(**tm) for tm in team_members]
+    # Validate and serialize the whole list in one pydantic-core pass
+    return Response(
+        content=TEAM_MEMBER_LIST_ADAPTER.dump_json(TEAM_MEMBER_LIST_ADAPTER.validate_python(team_members)),
+        media_type="application/json"
+    )
 
 
 @router.get("/{project_id}/stats")
@@ -362,42 +402,30 @@ async def get_project_stats(
     # Check access
     project = await check_project_access(project_id, current_user.username, db)
     
-    # Get all tasks
-    tasks = await db.select_where("tasks", "project_id", project_id)
+    # Task and team member counts, aggregated in Postgres
+    counts = (await get_project_counts([project_id])).get(project_id, {})
     
     # Count tasks by status
     status_counts = {
-        "todo": 0,
-        "in_progress": 0,
-        "completed": 0
+        "todo": counts.get("todo", 0),
+        "in_progress": counts.get("in_progress", 0),
+        "completed": counts.get("completed", 0)
     }
     
     # Count tasks by priority
     priority_counts = {
-        "low": 0,
-        "medium": 0,
-        "high": 0
+        "low": counts.get("low", 0),
+        "medium": counts.get("medium", 0),
+        "high": counts.get("high", 0)
     }
     
-    for task in tasks:
-        status = task.get("status", "todo")
-        priority = task.get("priority", "medium")
-        
-        if status in status_counts:
-            status_counts[status] += 1
-        if priority in priority_counts:
-            priority_counts[priority] += 1
-    
-    # Get team member count
-    team_members = await db.select_where("team_members", "project_id", project_id)
-    
     return {
         "project_id": project_id,
         "project_name": project["name"],
-        "total_tasks": len(tasks),
+        "total_tasks": counts.get("task_count", 0),
         "tasks_by_status": status_counts,
         "tasks_by_priority": priority_counts,
-        "team_member_count": len(team_members),
+        "team_member_count": counts.get("member_count", 0),
         "progress": project["progress"],
         "status": project["status"]
     }
@@ -1,16 +1,21 @@
 """
 Team member and role management API routes.
 """
-from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from typing import List, Optional, Union
 
 from models.auth import User
-from models.project import TeamMember, TeamMemberAdd
+from models.project import (
+    TeamMember, TeamMemberAdd, TeamMemberListResponse,
+    TEAM_MEMBER_LIST_ADAPTER, TEAM_MEMBER_PERMISSIONS_ADAPTER
+)
 from utils.middleware import get_current_user
 from utils.supabase_client import get_db, SupabaseDB
+from utils.cache import invalidate_project
+from utils import analytics_cache
 from utils.permissions import (
-    get_user_role_in_project, is_project_owner, is_project_member,
-    can_manage_team, Role
+    get_project_context, get_user_role_in_project, is_project_owner, is_project_member,
+    can_manage_team, get_role_permissions, Role
 )
 from utils.exceptions import (
     ProjectNotFoundException, UnauthorizedAccessException,
@@ -32,12 +37,16 @@ router = APIRouter(
 )
 
 
-async def verify_project_exists(project_id: str) -> dict:
+async def verify_project_exists(project_id: str, username: str) -> dict:
     """
     Verify that project exists.
     
+    The requesting user's role is loaded in the same query and cached, so
+    the owner/member checks that follow don't query again.
+    
     Args:
         project_id: Project UUID
+        username: Requesting user's username
         
     Returns:
         Project dictionary
@@ -45,8 +54,7 @@ async def verify_project_exists(project_id: str) -> dict:
     Raises:
         ProjectNotFoundException: If project doesn't exist
     """
-    db: SupabaseDB = get_db()
-    project = await db.select_by_id("projects", project_id)
+    project, _ = await get_project_context(project_id, username)
     
     if not project:
         raise ProjectNotFoundException(project_id)
@@ -54,6 +62,10 @@ async def verify_project_exists(project_id: str) -> dict:
     return project
 
 
+# Valid role names, built once for O(1) membership checks
+VALID_ROLES = frozenset(r.value for r in Role)
+
+
 def validate_role(role: str) -> None:
     """
     Validate that role is valid.
@@ -64,8 +76,7 @@ def validate_role(role: str) -> None:
     Raises:
         InvalidRoleException: If role is invalid
     """
-    valid_roles = [r.value for r in Role]
-    if role.lower() not in valid_roles:
+    if role.lower() not in VALID_ROLES:
         raise InvalidRoleException(role)
 
 
@@ -87,7 +98,7 @@ async def add_team_member(
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    project = await verify_project_exists(project_id)
+    project = await verify_project_exists(project_id, current_user.username)
     
     # Only owner can add members
     if not await is_project_owner(current_user.username, project_id):
@@ -100,49 +111,38 @@ async def add_team_member(
     if member_data.username == project["owner_id"]:
         raise InvalidDataException("Project owner is already a member by default")
     
-    # Check if user already exists in team
-    existing_members = await db.select_with_filters(
-        "team_members",
-        {"project_id": project_id, "username": member_data.username}
-    )
-    
-    if existing_members and len(existing_members) > 0:
-        # Update role instead of creating new entry
-        existing_member = existing_members[0]
-        updated_member = await db.update(
-            "team_members",
-            existing_member["id"],
-            {"role": member_data.role}
-        )
-        return TeamMember(**updated_member)
-    
-    # Add new team member
+    # Add new team member, or update the role of an existing one
     member_dict = {
         "project_id": project_id,
         "username": member_data.username,
         "role": member_data.role
     }
     
-    created_member = await db.insert("team_members", member_dict)
+    member = await db.upsert("team_members", member_dict, on_conflict=["project_id", "username"])
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
-    return TeamMember(**created_member)
+    return TeamMember(**member)
 
 
-@router.get("", response_model=List[TeamMember])
+@router.get("", response_model=Union[List[TeamMember], TeamMemberListResponse])
 async def get_team_members(
     project_id: str,
+    include: Optional[str] = Query(None, description="Set to 'permissions' to include each member's permissions"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get all team members of a project.
     
     Returns list of all members with their roles and assignment timestamps.
+    With ?include=permissions, returns the members together with each
+    member's permissions, derived from their role without further queries.
     Only accessible to project members.
     """
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    await verify_project_exists(project_id)
+    await verify_project_exists(project_id, current_user.username)
     
     # Verify user is a member
     if not await is_project_member(current_user.username, project_id):
@@ -151,7 +151,25 @@ async def get_team_members(
     # Get all team members
     members = await db.select_where("team_members", "project_id", project_id)
     
-    return [TeamMember(**member) for member in members]
+    # Validate and serialize the whole response in one pydantic-core pass
+    if include and "permissions" in include.split(","):
+        # Permissions are a pure function of the role
+        adapter = TEAM_MEMBER_PERMISSIONS_ADAPTER
+        payload = {
+            "members": members,
+            "permissions": {
+                m["username"]: [perm.value for perm in get_role_permissions(m["role"])]
+                for m in members
+            }
+        }
+    else:
+        adapter = TEAM_MEMBER_LIST_ADAPTER
+        payload = members
+    
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(payload)),
+        media_type="application/json"
+    )
 
 
 @router.put("/{username}", response_model=TeamMember)
@@ -172,7 +190,7 @@ async def update_member_role(
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    project = await verify_project_exists(project_id)
+    project = await verify_project_exists(project_id, current_user.username)
     
     # Only owner can update roles
     if not await is_project_owner(current_user.username, project_id):
@@ -185,25 +203,20 @@ async def update_member_role(
     if username == project["owner_id"]:
         raise InvalidDataException("Cannot change the project owner's role")
     
-    # Find the team member
-    members = await db.select_with_filters(
+    # Update role (matching on project and username in the same statement)
+    updated_members = await db.update_where(
         "team_members",
-        {"project_id": project_id, "username": username}
+        {"project_id": project_id, "username": username},
+        {"role": member_data.role}
     )
     
-    if not members or len(members) == 0:
+    if not updated_members:
         raise TeamMemberNotFoundException(f"User '{username}' is not a member of this project")
     
-    member = members[0]
-    
-    # Update role
-    updated_member = await db.update(
-        "team_members",
-        member["id"],
-        {"role": member_data.role}
-    )
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
-    return TeamMember(**updated_member)
+    return TeamMember(**updated_members[0])
 
 
 @router.delete("/{username}", status_code=status.HTTP_204_NO_CONTENT)
@@ -224,7 +237,7 @@ async def remove_team_member(
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    project = await verify_project_exists(project_id)
+    project = await verify_project_exists(project_id, current_user.username)
     
     # Only owner can remove members
     if not await is_project_owner(current_user.username, project_id):
@@ -234,19 +247,17 @@ async def remove_team_member(
     if username == project["owner_id"]:
         raise CannotRemoveOwnerException()
     
-    # Find the team member
-    members = await db.select_with_filters(
+    # Delete team member (matching on project and username in the same statement)
+    deleted_members = await db.delete_where(
         "team_members",
         {"project_id": project_id, "username": username}
     )
     
-    if not members or len(members) == 0:
+    if not deleted_members:
         raise TeamMemberNotFoundException(f"User '{username}' is not a member of this project")
     
-    member = members[0]
-    
-    # Delete team member
-    await db.delete("team_members", member["id"])
+    analytics_cache.invalidate(project_id)
+    await invalidate_project(project_id)
     
     # Note: Tasks assigned to this user remain unchanged
     # Consider adding a query parameter to handle task reassignment/deletion
@@ -269,7 +280,7 @@ async def get_team_member(
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    await verify_project_exists(project_id)
+    await verify_project_exists(project_id, current_user.username)
     
     # Verify user is a member
     if not await is_project_member(current_user.username, project_id):
@@ -291,20 +302,25 @@ async def get_team_member(
 async def get_member_permissions(
     project_id: str,
     username: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get the permissions for a specific team member.
     
     Returns the list of permissions the member has based on their role.
+    The ETag depends only on the role, so clients polling with
+    If-None-Match get an empty 304 until the role changes.
     Only accessible to project members.
-    """
-    from utils.permissions import get_role_permissions
     
+    For list views use GET /projects/{project_id}/members?include=permissions,
+    which returns every member's permissions in one request.
+    """
     db: SupabaseDB = get_db()
     
     # Verify project exists
-    await verify_project_exists(project_id)
+    await verify_project_exists(project_id, current_user.username)
     
     # Verify user is a member
     if not await is_project_member(current_user.username, project_id):
@@ -316,6 +332,12 @@ async def get_member_permissions(
     if not role:
         raise TeamMemberNotFoundException(f"User '{username}' is not a member of this project")
     
+    # Permissions are a pure function of the role
+    etag = f'"{role.lower()}-v1"'
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     # Get permissions for this role
     permissions = get_role_permissions(role)
     
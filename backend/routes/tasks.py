@@ -1,24 +1,25 @@
 """
 Tasks management API routes.
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from typing import List
 
-from models.auth import User
 from models.project import (
-    Task, TaskCreate, TaskUpdate, TaskStatusUpdate, TaskListResponse
+    Task, TaskCreate, TaskUpdate, TaskStatusUpdate, TaskListResponse,
+    TASK_LIST_ADAPTER
 )
-from utils.middleware import get_current_user
+from utils.middleware import ProjectContext, get_project_ctx
 from utils.supabase_client import get_db, SupabaseDB
+from utils.cache import invalidate_project
+from utils import analytics_cache
 from utils.permissions import (
-    get_user_role_in_project, is_project_member, 
+    is_project_member,
     can_edit_task, can_delete_task, can_assign_task,
     Permission, check_permission
 )
 from utils.exceptions import (
-    ProjectNotFoundException, TaskNotFoundException,
-    UnauthorizedAccessException, InvalidDataException,
-    InsufficientPermissionsException
+    TaskNotFoundException, InvalidDataException,
+    InsufficientPermissionsException, PreconditionFailedException
 )
 from utils.helpers import log_task_assignment
 
@@ -35,35 +36,11 @@ router = APIRouter(
 )
 
 
-async def verify_project_access(project_id: str, username: str) -> None:
-    """
-    Verify that project exists and user has access to it.
-    
-    Args:
-        project_id: Project UUID
-        username: Username to check
-        
-    Raises:
-        ProjectNotFoundException: If project doesn't exist
-        UnauthorizedAccessException: If user doesn't have access
-    """
-    db: SupabaseDB = get_db()
-    
-    # Check if project exists
-    project = await db.select_by_id("projects", project_id)
-    if not project:
-        raise ProjectNotFoundException(project_id)
-    
-    # Check if user is a member
-    if not await is_project_member(username, project_id):
-        raise UnauthorizedAccessException("You don't have access to this project")
-
-
 @router.post("", response_model=Task, status_code=status.HTTP_201_CREATED)
 async def create_task(
     project_id: str,
     task_data: TaskCreate,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Create a new task in a project.
@@ -79,12 +56,8 @@ async def create_task(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
     # Check permission
-    user_role = await get_user_role_in_project(current_user.username, project_id)
-    if not check_permission(user_role, Permission.CREATE_TASK):
+    if not check_permission(ctx.role, Permission.CREATE_TASK):
         raise InsufficientPermissionsException("create tasks")
     
     # If assigning to someone, verify they exist and are a project member
@@ -95,8 +68,8 @@ async def create_task(
             )
         
         # Check if user can assign tasks
-        if task_data.assigned_to != current_user.username:
-            if not await can_assign_task(current_user.username, project_id):
+        if task_data.assigned_to != ctx.user.username:
+            if not await can_assign_task(ctx.user.username, project_id):
                 raise InsufficientPermissionsException("assign tasks to others")
     
     # Prepare task data
@@ -105,13 +78,14 @@ async def create_task(
     
     # Create task
     created_task = await db.insert("tasks", task_dict)
+    analytics_cache.invalidate(project_id)
     
     # Log assignment if task is assigned
     if task_data.assigned_to:
         await log_task_assignment(
             task_id=created_task["id"],
             assigned_to=task_data.assigned_to,
-            assigned_by=current_user.username,
+            assigned_by=ctx.user.username,
             project_id=project_id
         )
     
@@ -121,7 +95,7 @@ async def create_task(
 @router.get("", response_model=TaskListResponse)
 async def get_all_tasks(
     project_id: str,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Get all tasks in a project.
@@ -131,20 +105,18 @@ async def get_all_tasks(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
     # Check permission
-    user_role = await get_user_role_in_project(current_user.username, project_id)
-    if not check_permission(user_role, Permission.VIEW_TASK):
+    if not check_permission(ctx.role, Permission.VIEW_TASK):
         raise InsufficientPermissionsException("view tasks")
     
     # Get all tasks for this project
     tasks = await db.select_where("tasks", "project_id", project_id)
     
-    return TaskListResponse(
-        tasks=[Task(**task) for task in tasks],
-        total=len(tasks)
+    # Validate the whole response in one pydantic-core call instead of per row
+    task_list = TASK_LIST_ADAPTER.validate_python({"tasks": tasks, "total": len(tasks)})
+    return Response(
+        content=TASK_LIST_ADAPTER.dump_json(task_list),
+        media_type="application/json"
     )
 
 
@@ -152,7 +124,7 @@ async def get_all_tasks(
 async def get_task(
     project_id: str,
     task_id: str,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Get a single task by ID.
@@ -162,24 +134,16 @@ async def get_task(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
     # Check permission
-    user_role = await get_user_role_in_project(current_user.username, project_id)
-    if not check_permission(user_role, Permission.VIEW_TASK):
+    if not check_permission(ctx.role, Permission.VIEW_TASK):
         raise InsufficientPermissionsException("view tasks")
     
-    # Get task
-    task = await db.select_by_id("tasks", task_id)
+    # Get task (only if it belongs to this project)
+    task = await db.select_by_id_scoped("tasks", task_id, "project_id", project_id)
     
     if not task:
         raise TaskNotFoundException(task_id)
     
-    # Verify task belongs to this project
-    if task["project_id"] != project_id:
-        raise TaskNotFoundException(task_id)
-    
     return Task(**task)
 
 
@@ -188,7 +152,7 @@ async def update_task(
     project_id: str,
     task_id: str,
     task_data: TaskUpdate,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Update a task.
@@ -198,6 +162,8 @@ async def update_task(
     - **assigned_to**: New assignee (optional)
     - **status**: New status (optional)
     - **priority**: New priority (optional)
+    - **if_unmodified_since**: The task's updated_at as last read (optional);
+      if the task changed since then the update is rejected with 412
     
     Permissions:
     - Owners and Managers can edit any task
@@ -206,36 +172,30 @@ async def update_task(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
-    # Get existing task
-    task = await db.select_by_id("tasks", task_id)
+    # Get existing task (only if it belongs to this project)
+    task = await db.select_by_id_scoped("tasks", task_id, "project_id", project_id)
     
     if not task:
         raise TaskNotFoundException(task_id)
     
-    # Verify task belongs to this project
-    if task["project_id"] != project_id:
-        raise TaskNotFoundException(task_id)
-    
     # Get task creator/owner (could be assigned_to or we track separately)
     # For now, we'll check if user can edit this task
     task_owner = task.get("assigned_to")
     
     # Check if user can edit this task
-    if not await can_edit_task(current_user.username, project_id, task_owner):
+    if not await can_edit_task(ctx.user.username, project_id, task_owner):
         raise InsufficientPermissionsException("edit this task")
     
     # Get only fields that were provided
     update_data = task_data.model_dump(exclude_unset=True)
+    expected_updated_at = update_data.pop("if_unmodified_since", None)
     
     if not update_data:
         raise InvalidDataException("No fields to update")
     
     # If changing assignment, verify permissions and target user
     if "assigned_to" in update_data and update_data["assigned_to"] != task_owner:
-        if not await can_assign_task(current_user.username, project_id):
+        if not await can_assign_task(ctx.user.username, project_id):
             raise InsufficientPermissionsException("assign tasks")
         
         # Verify new assignee is a project member
@@ -249,18 +209,30 @@ async def update_task(
             await log_task_assignment(
                 task_id=task_id,
                 assigned_to=update_data["assigned_to"],
-                assigned_by=current_user.username,
+                assigned_by=ctx.user.username,
                 project_id=project_id
             )
     
-    # Update task
-    updated_task = await db.update("tasks", task_id, update_data)
+    # Update task; if the status changed, project progress is recalculated
+    # and stored in the same database call (returned as project_progress,
+    # with progress_changed set when the stored value actually changed)
+    updated_task = await db.rpc(
+        "update_task_with_progress",
+        {
+            "tid": task_id,
+            "changes": update_data,
+            "expected_updated_at": expected_updated_at.isoformat() if expected_updated_at else None
+        }
+    )
+    if not updated_task:
+        # Deleted since it was read above
+        raise TaskNotFoundException(task_id)
+    if updated_task.get("conflict"):
+        raise PreconditionFailedException("Task was modified since it was last read")
     
-    # If status was updated, recalculate project progress
-    if "status" in update_data:
-        from utils.analytics import calculate_project_progress
-        new_progress = await calculate_project_progress(project_id)
-        updated_task["project_progress"] = new_progress
+    analytics_cache.invalidate(project_id)
+    if updated_task.get("progress_changed"):
+        await invalidate_project(project_id)
     
     return Task(**updated_task)
 
@@ -270,7 +242,7 @@ async def update_task_status(
     project_id: str,
     task_id: str,
     status_data: TaskStatusUpdate,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Update only the status of a task.
@@ -284,37 +256,33 @@ async def update_task_status(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
-    # Get existing task
-    task = await db.select_by_id("tasks", task_id)
+    # Get existing task (only if it belongs to this project)
+    task = await db.select_by_id_scoped("tasks", task_id, "project_id", project_id)
     
     if not task:
         raise TaskNotFoundException(task_id)
     
-    # Verify task belongs to this project
-    if task["project_id"] != project_id:
-        raise TaskNotFoundException(task_id)
-    
     # Check permission
-    user_role = await get_user_role_in_project(current_user.username, project_id)
     task_owner = task.get("assigned_to")
     
     # Allow status update if user has permission OR is the assigned user
-    has_permission = check_permission(user_role, Permission.UPDATE_TASK_STATUS)
-    is_assigned = task_owner == current_user.username
+    has_permission = check_permission(ctx.role, Permission.UPDATE_TASK_STATUS)
+    is_assigned = task_owner == ctx.user.username
     
     if not (has_permission or is_assigned):
         raise InsufficientPermissionsException("update task status")
     
-    # Update status
-    updated_task = await db.update("tasks", task_id, {"status": status_data.status})
+    # Update status and recalculate project progress in one database call
+    updated_task = await db.rpc(
+        "update_task_with_progress",
+        {"tid": task_id, "changes": {"status": status_data.status}}
+    )
+    if not updated_task:
+        raise TaskNotFoundException(task_id)
     
-    # Recalculate project progress after status change
-    from utils.analytics import calculate_project_progress
-    new_progress = await calculate_project_progress(project_id)
-    updated_task["project_progress"] = new_progress
+    analytics_cache.invalidate(project_id)
+    if updated_task.get("progress_changed"):
+        await invalidate_project(project_id)
     
     return Task(**updated_task)
 
@@ -323,7 +291,7 @@ async def update_task_status(
 async def delete_task(
     project_id: str,
     task_id: str,
-    current_user: User = Depends(get_current_user)
+    ctx: ProjectContext = Depends(get_project_ctx)
 ):
     """
     Delete a task.
@@ -333,26 +301,20 @@ async def delete_task(
     """
     db: SupabaseDB = get_db()
     
-    # Verify project access
-    await verify_project_access(project_id, current_user.username)
-    
-    # Get existing task
-    task = await db.select_by_id("tasks", task_id)
+    # Get existing task (only if it belongs to this project)
+    task = await db.select_by_id_scoped("tasks", task_id, "project_id", project_id)
     
     if not task:
         raise TaskNotFoundException(task_id)
     
-    # Verify task belongs to this project
-    if task["project_id"] != project_id:
-        raise TaskNotFoundException(task_id)
-    
     # Check if user can delete this task
     task_owner = task.get("assigned_to")
-    if not await can_delete_task(current_user.username, project_id, task_owner):
+    if not await can_delete_task(ctx.user.username, project_id, task_owner):
         raise InsufficientPermissionsException("delete tasks")
     
     # Delete task
     await db.delete("tasks", task_id)
+    analytics_cache.invalidate(project_id)
     
     return None
 
@@ -1,14 +1,11 @@
 """
-Run script for the FastAPI application with hot-reload capability.
+Run script for the FastAPI application.
+
+Set APP_RELOAD=true for hot-reload during development (single worker).
 """
 import uvicorn
-import sys
-import os
-
-# Add current directory to path
-sys.path.insert(0, os.path.dirname(__file__))
 
-from utils.config import APP_HOST, APP_PORT
+from utils.config import APP_HOST, APP_PORT, APP_RELOAD, APP_WORKERS, APP_LOOP
 
 if __name__ == "__main__":
     print("=" * 50)
@@ -16,7 +13,8 @@ if __name__ == "__main__":
     print("=" * 50)
     print(f"Host: {APP_HOST}")
     print(f"Port: {APP_PORT}")
-    print(f"Hot-reload: Enabled")
+    print(f"Hot-reload: {'Enabled' if APP_RELOAD else 'Disabled'}")
+    print(f"Workers: {1 if APP_RELOAD else APP_WORKERS}")
     print(f"Docs: http://localhost:{APP_PORT}/docs")
     print("=" * 50)
     
@@ -24,7 +22,10 @@ if __name__ == "__main__":
         "app.main:app",
         host=APP_HOST,
         port=APP_PORT,
-        reload=True,  # Enable hot-reload for development
+        reload=APP_RELOAD,
+        workers=1 if APP_RELOAD else APP_WORKERS,
+        loop=APP_LOOP,
+        http="httptools",
         log_level="info"
     )
 
@@ -1,13 +1,51 @@
 """
 Setup script to help configure the backend environment.
-Run this script to create your .env file interactively.
+Run this script to create your .env file.
+
+Values are taken from environment variables when set. Missing values are
+prompted for when running in a terminal, and fall back to placeholders
+otherwise, so the script also works non-interactively (e.g. in CI).
 """
 import os
 import sys
+from string import Template
+
+
+# Contents of the generated .env file
+ENV_TEMPLATE = Template("""# Supabase Configuration
+SUPABASE_URL=$SUPABASE_URL
+SUPABASE_KEY=$SUPABASE_KEY
+SUPABASE_SERVICE_ROLE_KEY=$SUPABASE_SERVICE_ROLE_KEY
+
+# Application Configuration
+APP_HOST=$APP_HOST
+APP_PORT=$APP_PORT
+""")
+
+
+def get_setting(key: str, prompt: str, default: str, interactive: bool) -> str:
+    """
+    Get a setting from the environment, a prompt, or its default.
+    
+    Args:
+        key: Environment variable name
+        prompt: Prompt shown when asking interactively
+        default: Value used when nothing else is provided
+        interactive: Whether prompting is allowed
+        
+    Returns:
+        Setting value
+    """
+    value = os.environ.get(key, "").strip()
+    if not value and interactive:
+        value = input(prompt).strip()
+    return value or default
 
 
 def create_env_file():
-    """Interactive script to create .env file."""
+    """Create the .env file from environment variables and/or prompts."""
+    interactive = sys.stdin.isatty()
+    
     print("=" * 60)
     print("🚀 Project Management API - Setup")
     print("=" * 60)
@@ -15,49 +53,51 @@ def create_env_file():
     
     # Check if .env already exists
     if os.path.exists(".env"):
+        if not interactive:
+            print("❌ .env file already exists. Existing .env file kept.")
+            return
         response = input("⚠️  .env file already exists. Overwrite? (y/N): ")
         if response.lower() != 'y':
             print("❌ Setup cancelled. Existing .env file kept.")
             return
     
-    print("📝 Please enter your Supabase credentials:")
-    print("   (You can find these in your Supabase dashboard at Settings > API)")
-    print()
+    if interactive:
+        print("📝 Please enter your Supabase credentials:")
+        print("   (You can find these in your Supabase dashboard at Settings > API)")
+        print()
     
     # Get Supabase credentials
-    supabase_url = input("Supabase URL (e.g., https://xxx.supabase.co): ").strip()
-    if not supabase_url:
-        supabase_url = "https://your-project-id.supabase.co"
-    
-    supabase_key = input("Supabase Anon/Public Key: ").strip()
-    if not supabase_key:
-        supabase_key = "your_supabase_anon_key_here"
+    settings = {
+        "SUPABASE_URL": get_setting(
+            "SUPABASE_URL", "Supabase URL (e.g., https://xxx.supabase.co): ",
+            "https://your-project-id.supabase.co", interactive
+        ),
+        "SUPABASE_KEY": get_setting(
+            "SUPABASE_KEY", "Supabase Anon/Public Key: ",
+            "your_supabase_anon_key_here", interactive
+        ),
+        "SUPABASE_SERVICE_ROLE_KEY": get_setting(
+            "SUPABASE_SERVICE_ROLE_KEY", "Supabase Service Role Key (optional, press Enter to skip): ",
+            "your_supabase_service_role_key_here", interactive
+        ),
+    }
     
-    supabase_service_key = input("Supabase Service Role Key (optional, press Enter to skip): ").strip()
-    if not supabase_service_key:
-        supabase_service_key = "your_supabase_service_role_key_here"
-    
-    print()
-    print("⚙️  Server Configuration (press Enter for defaults):")
+    if interactive:
+        print()
+        print("⚙️  Server Configuration (press Enter for defaults):")
     
-    app_host = input("Host [0.0.0.0]: ").strip() or "0.0.0.0"
-    app_port = input("Port [8000]: ").strip() or "8000"
+    settings["APP_HOST"] = get_setting("APP_HOST", "Host [0.0.0.0]: ", "0.0.0.0", interactive)
+    settings["APP_PORT"] = get_setting("APP_PORT", "Port [8000]: ", "8000", interactive)
     
     # Create .env content
-    env_content = f"""# Supabase Configuration
-SUPABASE_URL={supabase_url}
-SUPABASE_KEY={supabase_key}
-SUPABASE_SERVICE_ROLE_KEY={supabase_service_key}
-
-# Application Configuration
-APP_HOST={app_host}
-APP_PORT={app_port}
-"""
+    env_content = ENV_TEMPLATE.substitute(settings)
     
     # Write .env file
     try:
-        with open(".env", "w") as f:
+        # Write to a temporary file first so an interrupt never leaves a partial .env
+        with open(".env.tmp", "w") as f:
             f.write(env_content)
+        os.replace(".env.tmp", ".env")
         print()
         print("=" * 60)
         print("✅ .env file created successfully!")
@@ -17,19 +17,12 @@ def setup_database():
         with open('sql/create_tables.sql', 'r') as f:
             sql_content = f.read()
         
-        # Split into individual statements
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        
-        # Execute each statement
-        for i, statement in enumerate(statements):
-            if statement and not statement.startswith('--'):
-                try:
-                    print(f"Executing statement {i+1}/{len(statements)}...")
-                    result = supabase.rpc('exec_sql', {'sql': statement}).execute()
-                    print(f"✅ Statement {i+1} executed successfully")
-                except Exception as e:
-                    print(f"❌ Error executing statement {i+1}: {e}")
-                    print(f"Statement: {statement[:100]}...")
+        # Send the whole script in one call. Postgres runs multi-statement
+        # strings itself, so there is no client-side splitting on ';'
+        # (which breaks on function bodies) and the script applies atomically.
+        print("Executing create_tables.sql...")
+        supabase.rpc('exec_sql', {'sql': sql_content}).execute()
+        print("✅ Schema applied successfully")
         
         print("\n🎉 Database setup completed!")
         print("You can now sign up and sign in with persistent user data.")
@@ -91,6 +91,13 @@ CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_assigned_to ON tasks(assigned_to);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+-- Composite indexes for per-project lookups: status counts/progress,
+-- a member's tasks in a project, and open work (partial, stays small)
+CREATE INDEX IF NOT EXISTS idx_tasks_project_status ON tasks(project_id, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_assigned_to ON tasks(project_id, assigned_to);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_open ON tasks(project_id, status) WHERE status <> 'completed';
+-- Most recently updated tasks per project (dashboard recent activity)
+CREATE INDEX IF NOT EXISTS idx_tasks_project_updated_at ON tasks(project_id, updated_at DESC);
 
 -- Create trigger for tasks (drop if exists first)
 DROP TRIGGER IF EXISTS update_tasks_updated_at ON tasks;
@@ -113,6 +120,7 @@ CREATE TABLE IF NOT EXISTS team_members (
 );
 
 -- Create indexes
+-- (project_id, username) lookups use the index behind UNIQUE(project_id, username)
 CREATE INDEX IF NOT EXISTS idx_team_members_project_id ON team_members(project_id);
 CREATE INDEX IF NOT EXISTS idx_team_members_username ON team_members(username);
 CREATE INDEX IF NOT EXISTS idx_team_members_role ON team_members(role);
@@ -137,6 +145,270 @@ ON CONFLICT (role_name) DO NOTHING;
 
 -- =====================================================
 
+-- 5. AGGREGATE FUNCTIONS
+-- Called via supabase.rpc() so counts are computed in Postgres
+-- instead of shipping every task/team_member row to the API
+
+-- Task and team member counts for a set of projects
+CREATE OR REPLACE FUNCTION project_counts(project_ids UUID[])
+RETURNS TABLE (
+    project_id UUID,
+    task_count BIGINT,
+    member_count BIGINT,
+    todo BIGINT,
+    in_progress BIGINT,
+    completed BIGINT,
+    low BIGINT,
+    medium BIGINT,
+    high BIGINT
+) AS $$
+    SELECT
+        p.id,
+        COALESCE(t.task_count, 0),
+        COALESCE(m.member_count, 0),
+        COALESCE(t.todo, 0),
+        COALESCE(t.in_progress, 0),
+        COALESCE(t.completed, 0),
+        COALESCE(t.low, 0),
+        COALESCE(t.medium, 0),
+        COALESCE(t.high, 0)
+    FROM UNNEST(project_ids) AS p(id)
+    LEFT JOIN (
+        SELECT
+            tk.project_id,
+            COUNT(*) AS task_count,
+            COUNT(*) FILTER (WHERE tk.status = 'todo') AS todo,
+            COUNT(*) FILTER (WHERE tk.status = 'in_progress') AS in_progress,
+            COUNT(*) FILTER (WHERE tk.status = 'completed') AS completed,
+            COUNT(*) FILTER (WHERE tk.priority = 'low') AS low,
+            COUNT(*) FILTER (WHERE tk.priority = 'medium') AS medium,
+            COUNT(*) FILTER (WHERE tk.priority = 'high') AS high
+        FROM tasks tk
+        WHERE tk.project_id = ANY(project_ids)
+        GROUP BY tk.project_id
+    ) t ON t.project_id = p.id
+    LEFT JOIN (
+        SELECT tm.project_id, COUNT(*) AS member_count
+        FROM team_members tm
+        WHERE tm.project_id = ANY(project_ids)
+        GROUP BY tm.project_id
+    ) m ON m.project_id = p.id;
+$$ LANGUAGE sql STABLE;
+
+-- Projects visible to a user (owned or team member) with the user's role
+-- Ownership wins when the owner also has a team_members row
+-- Ordered owned projects first, then team projects, each by created_at
+-- (callers and user_dashboard rely on this order)
+CREATE OR REPLACE FUNCTION user_projects(uname TEXT)
+RETURNS TABLE (
+    id UUID,
+    name TEXT,
+    description TEXT,
+    owner_id TEXT,
+    status TEXT,
+    progress INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    role TEXT
+) AS $$
+    SELECT
+        d.id, d.name, d.description, d.owner_id, d.status,
+        d.progress, d.created_at, d.updated_at, d.role
+    FROM (
+        SELECT DISTINCT ON (u.id) u.*
+        FROM (
+            SELECT p.*, 'owner'::TEXT AS role, 0 AS rank
+            FROM projects p
+            WHERE p.owner_id = uname
+            UNION ALL
+            SELECT p.*, tm.role, 1 AS rank
+            FROM team_members tm
+            JOIN projects p ON p.id = tm.project_id
+            WHERE tm.username = uname
+        ) u
+        ORDER BY u.id, u.rank
+    ) d
+    ORDER BY d.rank, d.created_at, d.id;
+$$ LANGUAGE sql STABLE;
+
+-- A project plus one user's role in it (NULL when not a member),
+-- used by the access checks to avoid separate project/role lookups
+CREATE OR REPLACE FUNCTION project_context(pid UUID, uname TEXT)
+RETURNS TABLE (
+    id UUID,
+    name TEXT,
+    description TEXT,
+    owner_id TEXT,
+    status TEXT,
+    progress INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    role TEXT
+) AS $$
+    SELECT
+        p.id, p.name, p.description, p.owner_id, p.status,
+        p.progress, p.created_at, p.updated_at,
+        CASE WHEN p.owner_id = uname THEN 'owner' ELSE tm.role END AS role
+    FROM projects p
+    LEFT JOIN team_members tm ON tm.project_id = p.id AND tm.username = uname
+    WHERE p.id = pid
+    LIMIT 1;
+$$ LANGUAGE sql STABLE;
+
+-- Percentage of a project's tasks that are completed (0 with no tasks)
+CREATE OR REPLACE FUNCTION project_progress(pid UUID)
+RETURNS INTEGER AS $$
+    SELECT COALESCE(
+        (COUNT(*) FILTER (WHERE status = 'completed') * 100 / NULLIF(COUNT(*), 0))::INTEGER,
+        0
+    )
+    FROM tasks
+    WHERE project_id = pid;
+$$ LANGUAGE sql STABLE;
+
+-- Apply a partial task update (keys present in changes) and, when the
+-- status changes, return the recalculated project progress and store it
+-- if it differs (progress_changed tells the caller whether it did).
+-- With expected_updated_at, the update only applies if the task is
+-- unchanged since then (optimistic concurrency).
+-- Returns NULL if the task doesn't exist, or {"conflict": true} if it
+-- exists but was modified since expected_updated_at.
+DROP FUNCTION IF EXISTS update_task_with_progress(UUID, JSONB);
+CREATE OR REPLACE FUNCTION update_task_with_progress(
+    tid UUID,
+    changes JSONB,
+    expected_updated_at TIMESTAMP WITH TIME ZONE DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    updated tasks;
+    new_progress INTEGER;
+    progress_changed BOOLEAN;
+BEGIN
+    UPDATE tasks SET
+        title = CASE WHEN changes ? 'title' THEN changes->>'title' ELSE title END,
+        description = CASE WHEN changes ? 'description' THEN changes->>'description' ELSE description END,
+        assigned_to = CASE WHEN changes ? 'assigned_to' THEN changes->>'assigned_to' ELSE assigned_to END,
+        status = CASE WHEN changes ? 'status' THEN changes->>'status' ELSE status END,
+        priority = CASE WHEN changes ? 'priority' THEN changes->>'priority' ELSE priority END
+    WHERE id = tid
+      AND (expected_updated_at IS NULL OR updated_at = expected_updated_at)
+    RETURNING * INTO updated;
+    
+    IF NOT FOUND THEN
+        IF expected_updated_at IS NOT NULL AND EXISTS (SELECT 1 FROM tasks WHERE id = tid) THEN
+            RETURN jsonb_build_object('conflict', TRUE);
+        END IF;
+        RETURN NULL;
+    END IF;
+    
+    IF NOT changes ? 'status' THEN
+        RETURN to_jsonb(updated);
+    END IF;
+    
+    new_progress := project_progress(updated.project_id);
+    -- Skip the write (and the projects.updated_at trigger) when unchanged
+    UPDATE projects SET progress = new_progress
+    WHERE id = updated.project_id
+      AND progress IS DISTINCT FROM new_progress;
+    progress_changed := FOUND;
+    
+    RETURN to_jsonb(updated) || jsonb_build_object(
+        'project_progress', new_progress,
+        'progress_changed', progress_changed
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Complete /dashboard payload for a user in a single call:
+-- projects with role and counts, tasks assigned to the user, statistics
+CREATE OR REPLACE FUNCTION user_dashboard(uname TEXT)
+RETURNS JSONB AS $$
+    WITH up AS (
+        -- ordinality keeps user_projects' order through the aggregate below
+        SELECT * FROM user_projects(uname) WITH ORDINALITY
+    ),
+    my_tasks AS (
+        SELECT t.*, COALESCE(p.name, 'Unknown') AS project_name
+        FROM tasks t
+        LEFT JOIN projects p ON p.id = t.project_id
+        WHERE t.assigned_to = uname
+    )
+    SELECT jsonb_build_object(
+        'user_projects', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', up.id,
+                'name', up.name,
+                'progress', COALESCE(up.progress, 0),
+                'role', up.role,
+                'team_size', c.member_count + 1,
+                'task_count', c.task_count,
+                'status', up.status,
+                'description', up.description
+            ) ORDER BY up.ordinality)
+            FROM up
+            CROSS JOIN LATERAL (
+                SELECT
+                    (SELECT COUNT(*) FROM tasks tk WHERE tk.project_id = up.id) AS task_count,
+                    (SELECT COUNT(*) FROM team_members tm WHERE tm.project_id = up.id) AS member_count
+            ) c
+        ), '[]'::JSONB),
+        'my_tasks', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'id', mt.id,
+                'title', mt.title,
+                'status', mt.status,
+                'priority', mt.priority,
+                'project_id', mt.project_id,
+                'project_name', mt.project_name,
+                'description', mt.description,
+                'created_at', mt.created_at,
+                'updated_at', mt.updated_at
+            ))
+            FROM my_tasks mt
+        ), '[]'::JSONB),
+        'statistics', jsonb_build_object(
+            'total_projects', (SELECT COUNT(*) FROM up),
+            'total_assigned_tasks', (SELECT COUNT(*) FROM my_tasks),
+            'completed_tasks_by_me', (SELECT COUNT(*) FROM my_tasks WHERE status = 'completed'),
+            'in_progress_tasks_by_me', (SELECT COUNT(*) FROM my_tasks WHERE status = 'in_progress')
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Per-member task productivity for a project: the owner first, then team
+-- members, each with assigned/completed counts and the average number of
+-- whole days from creation to completion (NULL when nothing completed)
+CREATE OR REPLACE FUNCTION project_productivity(pid UUID)
+RETURNS TABLE (
+    username TEXT,
+    tasks_assigned BIGINT,
+    tasks_completed BIGINT,
+    average_completion_days NUMERIC
+) AS $$
+    WITH members AS (
+        SELECT p.owner_id AS username, 0 AS rank
+        FROM projects p
+        WHERE p.id = pid
+        UNION ALL
+        SELECT tm.username, 1 AS rank
+        FROM team_members tm
+        WHERE tm.project_id = pid
+    )
+    SELECT
+        m.username,
+        COUNT(t.id),
+        COUNT(t.id) FILTER (WHERE t.status = 'completed'),
+        AVG(FLOOR(EXTRACT(EPOCH FROM (t.updated_at - t.created_at)) / 86400))
+            FILTER (WHERE t.status = 'completed' AND t.updated_at >= t.created_at)
+    FROM members m
+    LEFT JOIN tasks t ON t.project_id = pid AND t.assigned_to = m.username
+    GROUP BY m.username, m.rank
+    ORDER BY m.rank;
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+
 -- VERIFICATION QUERIES
 -- Run these to verify your tables were created successfully
 
@@ -1,11 +1,14 @@
 """
 Test script to debug authentication issues.
 """
-import requests
+import httpx
 import json
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive client so every call reuses the same connection
+client = httpx.Client(base_url=BASE_URL, timeout=10.0)
+
 def test_signup():
     """Test user signup."""
     print("Testing signup...")
@@ -16,7 +19,7 @@ def test_signup():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/signup", json=data)
+        response = client.post("/auth/signup", json=data)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
@@ -38,7 +41,7 @@ def test_login():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/auth/login", json=data)
+        response = client.post("/auth/login", json=data)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
@@ -57,7 +60,7 @@ def test_verify(token):
     headers = {"Authorization": f"Bearer {token}"}
     
     try:
-        response = requests.get(f"{BASE_URL}/auth/verify", headers=headers)
+        response = client.get("/auth/verify", headers=headers)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
@@ -100,4 +103,5 @@ if __name__ == "__main__":
     else:
         print("Signup failed - user may already exist")
     
+    client.close()
     print("\n=== Test Complete ===")
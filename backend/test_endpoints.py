@@ -4,161 +4,264 @@ Comprehensive API endpoint testing script
 Tests all 22 endpoints with various scenarios
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 import time
 import sys
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, NamedTuple, Optional
+
+# Static request payloads (read-only; encoded once on APITester)
+SIGNUP_PAYLOAD = MappingProxyType({
+    "username": "testuser123",
+    "email": "test@example.com",
+    "password": "password123"
+})
+LOGIN_PAYLOAD = MappingProxyType({"username": "testuser123", "password": "password123"})
+MEMBER_SIGNUP_PAYLOAD = MappingProxyType({
+    "username": "testmember123",
+    "email": "member@example.com",
+    "password": "password123"
+})
+PROJECT_PAYLOAD = MappingProxyType({
+    "name": "Test Project",
+    "description": "A test project for API testing"
+})
+PROJECT_UPDATE_PAYLOAD = MappingProxyType({
+    "name": "Updated Test Project",
+    "description": "Updated description"
+})
+TASK_PAYLOAD = MappingProxyType({
+    "title": "Test Task",
+    "description": "A test task for API testing",
+    "priority": "high",
+    "due_date": "2025-12-31T23:59:59Z"
+})
+TASK_UPDATE_PAYLOAD = MappingProxyType({
+    "title": "Updated Test Task",
+    "description": "Updated task description",
+    "priority": "medium"
+})
+STATUS_PAYLOAD = MappingProxyType({"status": "in_progress"})
+ADD_MEMBER_PAYLOAD = MappingProxyType({"username": "testmember123", "role": "developer"})
+ROLE_UPDATE_PAYLOAD = MappingProxyType({"role": "manager"})
+INVALID_PAYLOAD = MappingProxyType({"invalid": "data"})
+
+
+def _encode(payload: Mapping[str, Any]) -> bytes:
+    """Serialize a static payload to a JSON request body"""
+    return orjson.dumps(dict(payload))
+
+
+class Result(NamedTuple):
+    """One logged test outcome (a plain tuple, converted to a dict for the report)"""
+    endpoint: str
+    method: str
+    status_code: int
+    success: bool
+    message: str
+    timestamp: int  # time.monotonic_ns() when logged
+
 
 class APITester:
+    # Fixed payloads, serialized once instead of on every request
+    _SIGNUP_BODY = _encode(SIGNUP_PAYLOAD)
+    _LOGIN_BODY = _encode(LOGIN_PAYLOAD)
+    _MEMBER_SIGNUP_BODY = _encode(MEMBER_SIGNUP_PAYLOAD)
+    _PROJECT_BODY = _encode(PROJECT_PAYLOAD)
+    _PROJECT_UPDATE_BODY = _encode(PROJECT_UPDATE_PAYLOAD)
+    _TASK_BODY = _encode(TASK_PAYLOAD)
+    _TASK_UPDATE_BODY = _encode(TASK_UPDATE_PAYLOAD)
+    _STATUS_BODY = _encode(STATUS_PAYLOAD)
+    _ADD_MEMBER_BODY = _encode(ADD_MEMBER_PAYLOAD)
+    _ROLE_UPDATE_BODY = _encode(ROLE_UPDATE_PAYLOAD)
+    _INVALID_BODY = _encode(INVALID_PAYLOAD)
+    
+    _METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+    
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
-        self.session = requests.Session()
+        
+        # Keep-alive HTTP/2 pool that lets independent requests run
+        # concurrently, retrying failed connection attempts
+        self.session = httpx.AsyncClient(
+            base_url=base_url,
+            # Ask for compressed bodies; the API gzips large list/analytics responses
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+            # Bounded so a hung request can't stall the suite or hold a pool slot
+            timeout=httpx.Timeout(10.0),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                retries=3
+            )
+        )
+        
         self.token = None
         self.user_data = None
         self.project_id = None
         self.task_id = None
-        self.test_results = []
+        
+        # Path prefixes, built once the IDs are known
+        self._project_path = None
+        self._task_path = None
+        self._passed = 0
+        self._failed = 0
+        self._failures = []
+        
+        # Results are streamed to the JSON Lines report as they are logged
+        self._report_fp = None
         
     def log_test(self, endpoint: str, method: str, status_code: int, success: bool, message: str = ""):
         """Log test result"""
-        result = {
-            "endpoint": endpoint,
-            "method": method,
-            "status_code": status_code,
-            "success": success,
-            "message": message,
-            "timestamp": time.time()
-        }
-        self.test_results.append(result)
+        result = Result(endpoint, method, status_code, success, message, time.monotonic_ns())
+        if success:
+            self._passed += 1
+        else:
+            self._failed += 1
+            self._failures.append(result)
+        
+        if self._report_fp is None:
+            self._report_fp = open("test_report.jsonl", "wb")
+        self._report_fp.write(orjson.dumps(result._asdict()))
+        self._report_fp.write(b"\n")
         
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{status} {method} {endpoint} - {status_code} - {message}")
     
-    def make_request(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None) -> requests.Response:
-        """Make HTTP request with error handling"""
-        url = f"{self.base_url}{endpoint}"
-        default_headers = {"Content-Type": "application/json"}
-        
-        if headers:
-            default_headers.update(headers)
-        
-        if self.token:
-            default_headers["Authorization"] = f"Bearer {self.token}"
+    def _json(self, response: httpx.Response) -> Any:
+        """Decode a JSON response body"""
+        return orjson.loads(response.content)
+    
+    def set_token(self, token: Optional[str]):
+        """Store the auth token and send it with every subsequent request"""
+        self.token = token
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        else:
+            self.session.headers.pop("Authorization", None)
+    
+    async def make_request(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None, raw: bytes = None) -> Optional[httpx.Response]:
+        """Make HTTP request with error handling (raw sends an already-encoded JSON body)"""
+        # Content-Type and Authorization live on the client's default headers,
+        # so only per-call extras are passed and nothing is merged here
+        method = method.upper()
+        if method not in self._METHODS:
+            raise ValueError(f"Unsupported method: {method}")
         
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, headers=default_headers)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, headers=default_headers)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, headers=default_headers)
-            elif method.upper() == "PATCH":
-                response = self.session.patch(url, json=data, headers=default_headers)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, headers=default_headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            return response
-        except requests.exceptions.RequestException as e:
+            return await self.session.request(method, endpoint, content=raw, json=data, headers=headers)
+        except httpx.HTTPError as e:
             print(f"Request failed: {e}")
             return None
     
-    def test_auth_endpoints(self):
+    async def test_auth_endpoints(self):
         """Test authentication endpoints"""
         print("\n🔐 Testing Authentication Endpoints")
         
-        # Test 1: Signup
-        signup_data = {
-            "username": "testuser123",
-            "email": "test@example.com",
-            "password": "password123"
-        }
-        response = self.make_request("POST", "/auth/signup", signup_data)
+        # Test 1: Signup (the team member used later is created alongside)
+        response, member = await asyncio.gather(
+            self.make_request("POST", "/auth/signup", raw=self._SIGNUP_BODY),
+            self.make_request("POST", "/auth/signup", raw=self._MEMBER_SIGNUP_BODY)
+        )
+        if member and member.status_code == 200:
+            self.log_test("/auth/signup", "POST", member.status_code, True, "Member user created")
+        
         if response and response.status_code == 200:
-            self.user_data = response.json()
+            self.user_data = self._json(response)
             self.log_test("/auth/signup", "POST", response.status_code, True, "User created successfully")
         else:
             self.log_test("/auth/signup", "POST", response.status_code if response else 0, False, "Signup failed")
         
         # Test 2: Login
-        login_data = {
-            "username": "testuser123",
-            "password": "password123"
-        }
-        response = self.make_request("POST", "/auth/login", login_data)
+        response = await self.make_request("POST", "/auth/login", raw=self._LOGIN_BODY)
         if response and response.status_code == 200:
-            login_response = response.json()
-            self.token = login_response["data"]["token"]
+            login_response = self._json(response)
+            self.set_token(login_response["data"]["token"])
             self.log_test("/auth/login", "POST", response.status_code, True, "Login successful")
         else:
             self.log_test("/auth/login", "POST", response.status_code if response else 0, False, "Login failed")
         
         # Test 3: Verify Token
-        response = self.make_request("GET", "/auth/verify")
+        response = await self.make_request("GET", "/auth/verify")
         if response and response.status_code == 200:
             self.log_test("/auth/verify", "GET", response.status_code, True, "Token verified")
         else:
             self.log_test("/auth/verify", "GET", response.status_code if response else 0, False, "Token verification failed")
+    
+    async def _ensure_token(self):
+        """Log in only if no token has been obtained yet"""
+        if self.token is not None:
+            return
         
-        # Test 4: Logout
-        response = self.make_request("POST", "/auth/logout")
+        response = await self.make_request("POST", "/auth/login", raw=self._LOGIN_BODY)
         if response and response.status_code == 200:
+            self.set_token(self._json(response)["data"]["token"])
+    
+    async def test_logout(self):
+        """Test logout (run last, since it invalidates the shared token)"""
+        print("\n🔒 Testing Logout")
+        
+        response = await self.make_request("POST", "/auth/logout")
+        if response and response.status_code == 200:
+            self.set_token(None)
             self.log_test("/auth/logout", "POST", response.status_code, True, "Logout successful")
         else:
             self.log_test("/auth/logout", "POST", response.status_code if response else 0, False, "Logout failed")
     
-    def test_project_endpoints(self):
+    async def test_project_endpoints(self):
         """Test project endpoints"""
         print("\n📁 Testing Project Endpoints")
         
-        # Re-login for project tests
-        login_data = {"username": "testuser123", "password": "password123"}
-        response = self.make_request("POST", "/auth/login", login_data)
-        if response and response.status_code == 200:
-            self.token = response.json()["data"]["token"]
+        await self._ensure_token()
         
         # Test 1: Create Project
-        project_data = {
-            "name": "Test Project",
-            "description": "A test project for API testing"
-        }
-        response = self.make_request("POST", "/projects", project_data)
+        response = await self.make_request("POST", "/projects", raw=self._PROJECT_BODY)
         if response and response.status_code == 200:
-            self.project_id = response.json()["data"]["id"]
+            self.project_id = self._json(response)["data"]["id"]
+            self._project_path = f"/projects/{self.project_id}"
             self.log_test("/projects", "POST", response.status_code, True, "Project created successfully")
         else:
             self.log_test("/projects", "POST", response.status_code if response else 0, False, "Project creation failed")
         
+        # Read-backs share the HTTP/2 connection as concurrent streams
+        reads = [self.make_request("GET", "/projects")]
+        if self.project_id:
+            reads.append(self.make_request("GET", self._project_path))
+        all_projects, *project = await asyncio.gather(*reads)
+        
         # Test 2: Get All Projects
-        response = self.make_request("GET", "/projects")
+        response = all_projects
         if response and response.status_code == 200:
             self.log_test("/projects", "GET", response.status_code, True, "Projects retrieved successfully")
+            
+            # Owned projects first, then team projects, each by created_at
+            projects = self._json(response)["projects"]
+            order = [(p["owner_id"] != LOGIN_PAYLOAD["username"], p["created_at"]) for p in projects]
+            ordered = order == sorted(order)
+            self.log_test("/projects", "GET", response.status_code, ordered,
+                          "Projects ordered owned-first by creation" if ordered else "Projects returned out of order")
         else:
             self.log_test("/projects", "GET", response.status_code if response else 0, False, "Failed to retrieve projects")
         
         # Test 3: Get Project by ID
         if self.project_id:
-            response = self.make_request("GET", f"/projects/{self.project_id}")
+            response = project[0]
             if response and response.status_code == 200:
-                self.log_test(f"/projects/{self.project_id}", "GET", response.status_code, True, "Project retrieved successfully")
+                self.log_test(self._project_path, "GET", response.status_code, True, "Project retrieved successfully")
             else:
-                self.log_test(f"/projects/{self.project_id}", "GET", response.status_code if response else 0, False, "Failed to retrieve project")
+                self.log_test(self._project_path, "GET", response.status_code if response else 0, False, "Failed to retrieve project")
         
         # Test 4: Update Project
         if self.project_id:
-            update_data = {
-                "name": "Updated Test Project",
-                "description": "Updated description"
-            }
-            response = self.make_request("PUT", f"/projects/{self.project_id}", update_data)
+            response = await self.make_request("PUT", self._project_path, raw=self._PROJECT_UPDATE_BODY)
             if response and response.status_code == 200:
-                self.log_test(f"/projects/{self.project_id}", "PUT", response.status_code, True, "Project updated successfully")
+                self.log_test(self._project_path, "PUT", response.status_code, True, "Project updated successfully")
             else:
-                self.log_test(f"/projects/{self.project_id}", "PUT", response.status_code if response else 0, False, "Project update failed")
+                self.log_test(self._project_path, "PUT", response.status_code if response else 0, False, "Project update failed")
     
-    def test_task_endpoints(self):
+    async def test_task_endpoints(self):
         """Test task endpoints"""
         print("\n📋 Testing Task Endpoints")
         
@@ -166,58 +269,55 @@ class APITester:
             print("Skipping task tests - no project ID available")
             return
         
+        await self._ensure_token()
+        
         # Test 1: Create Task
-        task_data = {
-            "title": "Test Task",
-            "description": "A test task for API testing",
-            "priority": "high",
-            "due_date": "2025-12-31T23:59:59Z"
-        }
-        response = self.make_request("POST", f"/projects/{self.project_id}/tasks", task_data)
+        response = await self.make_request("POST", f"{self._project_path}/tasks", raw=self._TASK_BODY)
         if response and response.status_code == 200:
-            self.task_id = response.json()["data"]["id"]
-            self.log_test(f"/projects/{self.project_id}/tasks", "POST", response.status_code, True, "Task created successfully")
+            self.task_id = self._json(response)["data"]["id"]
+            self._task_path = f"{self._project_path}/tasks/{self.task_id}"
+            self.log_test(f"{self._project_path}/tasks", "POST", response.status_code, True, "Task created successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/tasks", "POST", response.status_code if response else 0, False, "Task creation failed")
+            self.log_test(f"{self._project_path}/tasks", "POST", response.status_code if response else 0, False, "Task creation failed")
+        
+        # Read-backs share the HTTP/2 connection as concurrent streams
+        reads = [self.make_request("GET", f"{self._project_path}/tasks")]
+        if self.task_id:
+            reads.append(self.make_request("GET", self._task_path))
+        all_tasks, *task = await asyncio.gather(*reads)
         
         # Test 2: Get Project Tasks
-        response = self.make_request("GET", f"/projects/{self.project_id}/tasks")
+        response = all_tasks
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/tasks", "GET", response.status_code, True, "Tasks retrieved successfully")
+            self.log_test(f"{self._project_path}/tasks", "GET", response.status_code, True, "Tasks retrieved successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/tasks", "GET", response.status_code if response else 0, False, "Failed to retrieve tasks")
+            self.log_test(f"{self._project_path}/tasks", "GET", response.status_code if response else 0, False, "Failed to retrieve tasks")
         
         # Test 3: Get Task by ID
         if self.task_id:
-            response = self.make_request("GET", f"/projects/{self.project_id}/tasks/{self.task_id}")
+            response = task[0]
             if response and response.status_code == 200:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}", "GET", response.status_code, True, "Task retrieved successfully")
+                self.log_test(self._task_path, "GET", response.status_code, True, "Task retrieved successfully")
             else:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}", "GET", response.status_code if response else 0, False, "Failed to retrieve task")
+                self.log_test(self._task_path, "GET", response.status_code if response else 0, False, "Failed to retrieve task")
         
         # Test 4: Update Task
         if self.task_id:
-            update_data = {
-                "title": "Updated Test Task",
-                "description": "Updated task description",
-                "priority": "medium"
-            }
-            response = self.make_request("PUT", f"/projects/{self.project_id}/tasks/{self.task_id}", update_data)
+            response = await self.make_request("PUT", self._task_path, raw=self._TASK_UPDATE_BODY)
             if response and response.status_code == 200:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}", "PUT", response.status_code, True, "Task updated successfully")
+                self.log_test(self._task_path, "PUT", response.status_code, True, "Task updated successfully")
             else:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}", "PUT", response.status_code if response else 0, False, "Task update failed")
+                self.log_test(self._task_path, "PUT", response.status_code if response else 0, False, "Task update failed")
         
         # Test 5: Update Task Status
         if self.task_id:
-            status_data = {"status": "in_progress"}
-            response = self.make_request("PATCH", f"/projects/{self.project_id}/tasks/{self.task_id}/status", status_data)
+            response = await self.make_request("PATCH", f"{self._task_path}/status", raw=self._STATUS_BODY)
             if response and response.status_code == 200:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}/status", "PATCH", response.status_code, True, "Task status updated successfully")
+                self.log_test(f"{self._task_path}/status", "PATCH", response.status_code, True, "Task status updated successfully")
             else:
-                self.log_test(f"/projects/{self.project_id}/tasks/{self.task_id}/status", "PATCH", response.status_code if response else 0, False, "Task status update failed")
+                self.log_test(f"{self._task_path}/status", "PATCH", response.status_code if response else 0, False, "Task status update failed")
     
-    def test_member_endpoints(self):
+    async def test_member_endpoints(self):
         """Test team member endpoints"""
         print("\n👥 Testing Team Member Endpoints")
         
@@ -225,43 +325,30 @@ class APITester:
             print("Skipping member tests - no project ID available")
             return
         
-        # Test 1: Add Team Member (create another user first)
-        member_data = {
-            "username": "testmember123",
-            "email": "member@example.com",
-            "password": "password123"
-        }
-        response = self.make_request("POST", "/auth/signup", member_data)
-        if response and response.status_code == 200:
-            self.log_test("/auth/signup", "POST", response.status_code, True, "Member user created")
-        
-        # Add member to project
-        add_member_data = {
-            "username": "testmember123",
-            "role": "developer"
-        }
-        response = self.make_request("POST", f"/projects/{self.project_id}/members", add_member_data)
+        await self._ensure_token()
+        
+        # Test 1: Add Team Member (user was created in test_auth_endpoints)
+        response = await self.make_request("POST", f"{self._project_path}/members", raw=self._ADD_MEMBER_BODY)
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/members", "POST", response.status_code, True, "Team member added successfully")
+            self.log_test(f"{self._project_path}/members", "POST", response.status_code, True, "Team member added successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/members", "POST", response.status_code if response else 0, False, "Failed to add team member")
+            self.log_test(f"{self._project_path}/members", "POST", response.status_code if response else 0, False, "Failed to add team member")
         
         # Test 2: Get Team Members
-        response = self.make_request("GET", f"/projects/{self.project_id}/members")
+        response = await self.make_request("GET", f"{self._project_path}/members")
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/members", "GET", response.status_code, True, "Team members retrieved successfully")
+            self.log_test(f"{self._project_path}/members", "GET", response.status_code, True, "Team members retrieved successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/members", "GET", response.status_code if response else 0, False, "Failed to retrieve team members")
+            self.log_test(f"{self._project_path}/members", "GET", response.status_code if response else 0, False, "Failed to retrieve team members")
         
         # Test 3: Update Team Member Role
-        update_role_data = {"role": "manager"}
-        response = self.make_request("PUT", f"/projects/{self.project_id}/members/testmember123", update_role_data)
+        response = await self.make_request("PUT", f"{self._project_path}/members/testmember123", raw=self._ROLE_UPDATE_BODY)
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/members/testmember123", "PUT", response.status_code, True, "Team member role updated successfully")
+            self.log_test(f"{self._project_path}/members/testmember123", "PUT", response.status_code, True, "Team member role updated successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/members/testmember123", "PUT", response.status_code if response else 0, False, "Failed to update team member role")
+            self.log_test(f"{self._project_path}/members/testmember123", "PUT", response.status_code if response else 0, False, "Failed to update team member role")
     
-    def test_analytics_endpoints(self):
+    async def test_analytics_endpoints(self):
         """Test analytics endpoints"""
         print("\n📊 Testing Analytics Endpoints")
         
@@ -269,77 +356,106 @@ class APITester:
             print("Skipping analytics tests - no project ID available")
             return
         
+        await self._ensure_token()
+        
+        # Independent reads, issued concurrently
+        analytics, timeline, member = await asyncio.gather(
+            self.make_request("GET", f"{self._project_path}/analytics"),
+            self.make_request("GET", f"{self._project_path}/analytics/timeline"),
+            self.make_request("GET", f"{self._project_path}/analytics/member/testuser123")
+        )
+        
         # Test 1: Get Project Analytics
-        response = self.make_request("GET", f"/projects/{self.project_id}/analytics")
+        response = analytics
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/analytics", "GET", response.status_code, True, "Project analytics retrieved successfully")
+            self.log_test(f"{self._project_path}/analytics", "GET", response.status_code, True, "Project analytics retrieved successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/analytics", "GET", response.status_code if response else 0, False, "Failed to retrieve project analytics")
+            self.log_test(f"{self._project_path}/analytics", "GET", response.status_code if response else 0, False, "Failed to retrieve project analytics")
         
         # Test 2: Get Timeline Analytics
-        response = self.make_request("GET", f"/projects/{self.project_id}/analytics/timeline")
+        response = timeline
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/analytics/timeline", "GET", response.status_code, True, "Timeline analytics retrieved successfully")
+            self.log_test(f"{self._project_path}/analytics/timeline", "GET", response.status_code, True, "Timeline analytics retrieved successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/analytics/timeline", "GET", response.status_code if response else 0, False, "Failed to retrieve timeline analytics")
+            self.log_test(f"{self._project_path}/analytics/timeline", "GET", response.status_code if response else 0, False, "Failed to retrieve timeline analytics")
         
         # Test 3: Get Member Analytics
-        response = self.make_request("GET", f"/projects/{self.project_id}/analytics/member/testuser123")
+        response = member
         if response and response.status_code == 200:
-            self.log_test(f"/projects/{self.project_id}/analytics/member/testuser123", "GET", response.status_code, True, "Member analytics retrieved successfully")
+            self.log_test(f"{self._project_path}/analytics/member/testuser123", "GET", response.status_code, True, "Member analytics retrieved successfully")
         else:
-            self.log_test(f"/projects/{self.project_id}/analytics/member/testuser123", "GET", response.status_code if response else 0, False, "Failed to retrieve member analytics")
+            self.log_test(f"{self._project_path}/analytics/member/testuser123", "GET", response.status_code if response else 0, False, "Failed to retrieve member analytics")
     
-    def test_dashboard_endpoint(self):
+    async def test_dashboard_endpoint(self):
         """Test dashboard endpoint"""
         print("\n🏠 Testing Dashboard Endpoint")
         
+        await self._ensure_token()
+        
         # Test: Get Dashboard Summary
-        response = self.make_request("GET", "/dashboard")
+        response = await self.make_request("GET", "/dashboard")
         if response and response.status_code == 200:
             self.log_test("/dashboard", "GET", response.status_code, True, "Dashboard data retrieved successfully")
         else:
             self.log_test("/dashboard", "GET", response.status_code if response else 0, False, "Failed to retrieve dashboard data")
     
-    def test_error_cases(self):
+    async def test_error_cases(self):
         """Test error handling"""
         print("\n🚨 Testing Error Cases")
         
+        # Independent requests, issued concurrently
+        unauthorized, invalid_id, invalid_body = await asyncio.gather(
+            self.make_request("GET", "/projects"),
+            self.make_request("GET", "/projects/invalid-id"),
+            self.make_request("POST", "/projects", raw=self._INVALID_BODY)
+        )
+        
         # Test 1: Unauthorized request
-        response = self.make_request("GET", "/projects")
+        response = unauthorized
         if response and response.status_code == 401:
             self.log_test("/projects", "GET", response.status_code, True, "Unauthorized request properly rejected")
         else:
             self.log_test("/projects", "GET", response.status_code if response else 0, False, "Unauthorized request not properly handled")
         
         # Test 2: Invalid project ID
-        response = self.make_request("GET", "/projects/invalid-id")
+        response = invalid_id
         if response and response.status_code == 404:
             self.log_test("/projects/invalid-id", "GET", response.status_code, True, "Invalid project ID properly handled")
         else:
             self.log_test("/projects/invalid-id", "GET", response.status_code if response else 0, False, "Invalid project ID not properly handled")
         
         # Test 3: Invalid data
-        invalid_data = {"invalid": "data"}
-        response = self.make_request("POST", "/projects", invalid_data)
+        response = invalid_body
         if response and response.status_code == 400:
             self.log_test("/projects", "POST", response.status_code, True, "Invalid data properly rejected")
         else:
             self.log_test("/projects", "POST", response.status_code if response else 0, False, "Invalid data not properly handled")
     
-    def cleanup(self):
+    async def warm_up(self):
+        """Open a pooled connection before the first timed request"""
+        try:
+            await self.session.get("/health", timeout=2.0)
+        except httpx.HTTPError:
+            # Best effort; the first real request will connect instead
+            pass
+    
+    async def close(self):
+        """Close the HTTP connection pool"""
+        await self.session.aclose()
+    
+    async def cleanup(self):
         """Clean up test data"""
         print("\n🧹 Cleaning up test data")
         
         # Delete task
         if self.task_id and self.project_id:
-            response = self.make_request("DELETE", f"/projects/{self.project_id}/tasks/{self.task_id}")
+            response = await self.make_request("DELETE", self._task_path)
             if response and response.status_code == 200:
                 print("✅ Test task deleted")
         
         # Delete project
         if self.project_id:
-            response = self.make_request("DELETE", f"/projects/{self.project_id}")
+            response = await self.make_request("DELETE", self._project_path)
             if response and response.status_code == 200:
                 print("✅ Test project deleted")
         
@@ -350,47 +466,59 @@ class APITester:
         print("\n📊 Test Report")
         print("=" * 50)
         
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result["success"])
-        failed_tests = total_tests - passed_tests
+        passed_tests = self._passed
+        failed_tests = self._failed
+        total_tests = passed_tests + failed_tests
         
         print(f"Total Tests: {total_tests}")
         print(f"Passed: {passed_tests}")
         print(f"Failed: {failed_tests}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        
+        # Fixed-point tenths of a percent; an empty run reports 0.0% instead of dividing by zero
+        pct_tenths = (passed_tests * 1000) // total_tests if total_tests else 0
+        print(f"Success Rate: {pct_tenths // 10}.{pct_tenths % 10}%")
         
         if failed_tests > 0:
             print("\n❌ Failed Tests:")
-            for result in self.test_results:
-                if not result["success"]:
-                    print(f"  - {result['method']} {result['endpoint']}: {result['message']}")
-        
-        # Save detailed report
-        with open("test_report.json", "w") as f:
-            json.dump(self.test_results, f, indent=2)
-        print(f"\n📄 Detailed report saved to test_report.json")
+            for result in self._failures:
+                print(f"  - {result.method} {result.endpoint}: {result.message}")
+        
+        # Detailed report was written incrementally; just finish the file
+        if self._report_fp is not None:
+            self._report_fp.close()
+            self._report_fp = None
+            print("\n📄 Detailed report saved to test_report.jsonl")
     
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all tests"""
         print("🚀 Starting API Endpoint Tests")
         print("=" * 50)
         
+        await self.warm_up()
+        
         try:
-            self.test_auth_endpoints()
-            self.test_project_endpoints()
-            self.test_task_endpoints()
-            self.test_member_endpoints()
-            self.test_analytics_endpoints()
-            self.test_dashboard_endpoint()
-            self.test_error_cases()
+            await self.test_auth_endpoints()
+            await self.test_project_endpoints()
+            await self.test_task_endpoints()
+            await self.test_member_endpoints()
+            
+            # These groups only read existing data, so they run side by side
+            await asyncio.gather(
+                self.test_analytics_endpoints(),
+                self.test_dashboard_endpoint(),
+                self.test_error_cases()
+            )
             
         except KeyboardInterrupt:
             print("\n⏹️ Tests interrupted by user")
         except Exception as e:
             print(f"\n💥 Test suite failed with error: {e}")
         finally:
-            self.cleanup()
+            await self.cleanup()
+            if self.token:
+                await self.test_logout()
             self.generate_report()
+            await self.close()
 
 def main():
     """Main function"""
@@ -404,10 +532,14 @@ def main():
     
     tester = APITester(args.url)
     
+    async def cleanup_only():
+        await tester.cleanup()
+        await tester.close()
+    
     if args.cleanup_only:
-        tester.cleanup()
+        asyncio.run(cleanup_only())
     else:
-        tester.run_all_tests()
+        asyncio.run(tester.run_all_tests())
 
 if __name__ == "__main__":
     main()
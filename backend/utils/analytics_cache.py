@@ -0,0 +1,62 @@
+"""
+In-process TTL cache for read-only per-project analytics aggregates.
+
+Entries are keyed by project and carry the project's version number;
+invalidate() bumps the version so every cached aggregate for that project
+is skipped at once (same scheme as the response cache in app.main).
+The cache is per worker process, so other workers may serve an aggregate
+for up to ANALYTICS_CACHE_TTL seconds after a change.
+"""
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from cachetools import TTLCache
+
+from utils.config import ANALYTICS_CACHE_TTL
+
+T = TypeVar("T")
+
+_MISS = object()
+
+_cache: TTLCache = TTLCache(maxsize=1024, ttl=ANALYTICS_CACHE_TTL)
+# Versions must outlive cached entries so a reset can't resurrect stale ones
+_versions: TTLCache = TTLCache(maxsize=1024, ttl=ANALYTICS_CACHE_TTL * 20)
+
+
+def cached_analytics(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache an async analytics function whose first argument is a project ID.
+    
+    Remaining positional arguments (e.g. timeline days) are part of the key.
+    
+    Args:
+        name: Cache key prefix for the function (e.g. "timeline")
+    
+    Returns:
+        Decorator for the analytics function
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(project_id: str, *args: Any) -> T:
+            key = (project_id, _versions.get(project_id, 0), name, args)
+            value = _cache.get(key, _MISS)
+            if value is _MISS:
+                value = await func(project_id, *args)
+                _cache[key] = value
+            return value
+        
+        return wrapper
+    
+    return decorator
+
+
+def invalidate(project_id: str) -> None:
+    """
+    Drop all cached analytics for a project.
+    
+    Call after any change to the project's tasks or team membership.
+    
+    Args:
+        project_id: Project UUID
+    """
+    _versions[project_id] = _versions.get(project_id, 0) + 1
@@ -3,11 +3,10 @@ Authentication utility functions for signup, login, and token management.
 """
 import uuid
 from typing import Optional, Tuple
-from datetime import datetime
 
 from models.auth import (
     User, UserSignup, UserLogin, UserResponse, TokenResponse,
-    get_storage, InMemoryStorage
+    get_storage, InMemoryStorage, hash_password, utc_now
 )
 
 
@@ -56,9 +55,9 @@ def signup(signup_data: UserSignup) -> Tuple[bool, str, Optional[TokenResponse]]
     new_user = User(
         id=user_id,
         username=signup_data.username,
-        password=signup_data.password,  # Plain text (not recommended for production)
+        password=hash_password(signup_data.password),
         email=signup_data.email,
-        created_at=datetime.now()
+        created_at=utc_now()
     )
     
     # Add user to storage
@@ -95,8 +94,8 @@ def login(login_data: UserLogin) -> Tuple[bool, str, Optional[TokenResponse]]:
     if not user:
         return False, "Invalid username or password", None
     
-    # Verify password (plain text comparison)
-    if user.password != login_data.password:
+    # Verify password against the stored argon2 hash
+    if not storage.check_password(user.username, login_data.password):
         return False, "Invalid username or password", None
     
     # Generate new token
@@ -142,12 +141,7 @@ def verify_token(token: str) -> Tuple[bool, Optional[UserResponse]]:
     """
     storage: InMemoryStorage = get_storage()
     
-    username = storage.get_username_by_token(token)
-    
-    if not username:
-        return False, None
-    
-    user = storage.get_user_by_username(username)
+    user = storage.get_user_by_token(token)
     
     if not user:
         return False, None
@@ -167,10 +161,5 @@ def get_user_from_token(token: str) -> Optional[User]:
     """
     storage: InMemoryStorage = get_storage()
     
-    username = storage.get_username_by_token(token)
-    
-    if not username:
-        return None
-    
-    return storage.get_user_by_username(username)
+    return storage.get_user_by_token(token)
 
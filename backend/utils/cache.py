@@ -0,0 +1,180 @@
+"""
+Optional Redis cache for project records and project roles.
+
+Enabled when REDIS_URL is set. Without it (or when Redis is unreachable)
+every lookup is a miss and every write/invalidation is a no-op, so callers
+always fall back to the database.
+
+Every project has a generation token that invalidate_project replaces.
+Cached values are stored with the generation they belong to, and a value
+from an older generation reads as a miss. Lookups return the generation
+they saw; callers pass it back when caching what they then loaded from the
+database, so a load that raced with an invalidation is stored under the
+old generation and never served.
+"""
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from utils.config import REDIS_URL, PROJECT_CACHE_TTL, ROLE_CACHE_TTL
+
+# Returned by lookups when nothing is cached (None is a valid cached role)
+MISS = object()
+
+# Generation tokens outlive every cached value; once one expires the
+# project is back at generation "0", which no live value can still carry
+_GEN_TTL = max(PROJECT_CACHE_TTL, ROLE_CACHE_TTL) * 20
+
+_redis: Optional[redis_asyncio.Redis] = None
+
+
+def get_redis() -> Optional[redis_asyncio.Redis]:
+    """
+    Get the shared Redis client.
+    
+    Returns:
+        Redis client, or None when caching is disabled
+    """
+    global _redis
+    if _redis is None and REDIS_URL:
+        _redis = redis_asyncio.from_url(REDIS_URL)
+    return _redis
+
+
+def _project_key(project_id: str) -> str:
+    return f"project:{project_id}"
+
+
+def _role_key(project_id: str, username: str) -> str:
+    # One key per (project, user) so every entry expires on its own TTL
+    return f"role:{project_id}:{username}"
+
+
+def _gen_key(project_id: str) -> str:
+    return f"gen:{project_id}"
+
+
+async def _get_current(client: redis_asyncio.Redis, project_id: str, key: str) -> Tuple[Optional[bytes], bytes]:
+    """
+    Read a cached value together with the project's current generation.
+    
+    Returns:
+        Tuple of (value payload, or None if missing/stale; current generation)
+    """
+    gen, value = await client.mget(_gen_key(project_id), key)
+    gen = gen or b"0"
+    if value is None:
+        return None, gen
+    value_gen, _, payload = value.partition(b"|")
+    return (payload if value_gen == gen else None), gen
+
+
+async def get_cached_project(project_id: str) -> Tuple[Any, Optional[bytes]]:
+    """
+    Get a cached project record.
+    
+    Args:
+        project_id: Project UUID
+    
+    Returns:
+        Tuple of (project dictionary or MISS, generation to pass to
+        set_cached_project)
+    """
+    client = get_redis()
+    if client is None:
+        return MISS, None
+    try:
+        payload, gen = await _get_current(client, project_id, _project_key(project_id))
+    except RedisError:
+        return MISS, None
+    return (MISS if payload is None else orjson.loads(payload)), gen
+
+
+async def set_cached_project(project_id: str, project: Dict[str, Any], gen: Optional[bytes]) -> None:
+    """
+    Cache a project record.
+    
+    Args:
+        project_id: Project UUID
+        project: Project dictionary
+        gen: Generation returned by the get_cached_project call that missed
+    """
+    client = get_redis()
+    if client is None or gen is None:
+        return
+    try:
+        await client.setex(_project_key(project_id), PROJECT_CACHE_TTL, gen + b"|" + orjson.dumps(project))
+    except RedisError:
+        pass
+
+
+async def get_cached_role(project_id: str, username: str) -> Tuple[Any, Optional[bytes]]:
+    """
+    Get a user's cached role in a project.
+    
+    Args:
+        project_id: Project UUID
+        username: Username
+    
+    Returns:
+        Tuple of (role string, None for a cached non-member, or MISS;
+        generation to pass to set_cached_role)
+    """
+    client = get_redis()
+    if client is None:
+        return MISS, None
+    try:
+        payload, gen = await _get_current(client, project_id, _role_key(project_id, username))
+    except RedisError:
+        return MISS, None
+    return (MISS if payload is None else payload.decode() or None), gen
+
+
+async def set_cached_role(project_id: str, username: str, role: Optional[str], gen: Optional[bytes]) -> None:
+    """
+    Cache a user's role in a project.
+    
+    Args:
+        project_id: Project UUID
+        username: Username
+        role: Role string, or None if the user is not a member
+        gen: Generation returned by the get_cached_role call that missed
+    """
+    client = get_redis()
+    if client is None or gen is None:
+        return
+    try:
+        # Empty role string caches a non-member
+        value = gen + b"|" + (role or "").encode()
+        await client.setex(_role_key(project_id, username), ROLE_CACHE_TTL, value)
+    except RedisError:
+        pass
+
+
+async def invalidate_project(project_id: str) -> None:
+    """
+    Make the cached project record and all cached roles for a project stale.
+    
+    Args:
+        project_id: Project UUID
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        # A random token (not a counter) can't repeat a generation that
+        # cached values written before the token expired may still carry
+        await client.set(_gen_key(project_id), os.urandom(8).hex(), ex=_GEN_TTL)
+    except RedisError:
+        pass
+
+
+async def close_cache() -> None:
+    """Close the Redis connection pool."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
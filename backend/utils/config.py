@@ -2,6 +2,8 @@
 Configuration module for environment variables and Supabase client initialization.
 """
 import os
+from typing import Optional
+import httpx
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
@@ -14,9 +16,36 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 APP_HOST = os.getenv("BACKEND_HOST", "0.0.0.0")
 APP_PORT = int(os.getenv("BACKEND_PORT", "8010"))
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
+# Server process settings (run.py)
+APP_RELOAD = os.getenv("APP_RELOAD", "false").lower() in ("1", "true", "yes")
+APP_WORKERS = int(os.getenv("APP_WORKERS", str((os.cpu_count() or 1) * 2)))
+APP_LOOP = os.getenv("APP_LOOP", "auto")  # "auto" picks uvloop when installed
+
+# Connection pool for PostgREST requests
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "120"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "80"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5.0"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "2.0"))
+
+# Optional Redis cache for project/role lookups (disabled when unset)
+REDIS_URL = os.getenv("REDIS_URL")
+PROJECT_CACHE_TTL = int(os.getenv("PROJECT_CACHE_TTL", "60"))
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "300"))
+
+# In-process cache for per-project analytics aggregates (seconds)
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "60"))
 
 # CORS Configuration
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+# Parsed once at import: stripped, non-empty origins. The frozenset is what
+# the CORS middleware checks each request's Origin header against.
+CORS_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
+)
+CORS_ORIGINS_SET = frozenset(CORS_ORIGINS)
 
 # Validate required environment variables
 if not SUPABASE_URL or not SUPABASE_KEY:
@@ -33,6 +62,46 @@ supabase_admin: Client = None
 if SUPABASE_SERVICE_ROLE_KEY:
     supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
 
+# Shared pooled HTTP client installed on the PostgREST client at startup
+_http_client: Optional[httpx.Client] = None
+
+def init_http_pool() -> httpx.Client:
+    """
+    Route all PostgREST requests through one pooled keep-alive HTTP/2 client.
+    
+    The replacement keeps the base URL and auth headers of the session
+    created by supabase-py. Timeouts come from SUPABASE_TIMEOUT and
+    SUPABASE_CONNECT_TIMEOUT, so a stalled request fails fast instead of
+    holding a pooled connection and worker thread.
+    
+    Returns:
+        httpx.Client: The shared HTTP client
+    """
+    global _http_client
+    if _http_client is None:
+        postgrest = supabase.postgrest
+        session = postgrest.session
+        _http_client = httpx.Client(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_KEEPALIVE
+            )
+        )
+        session.close()
+        postgrest.session = _http_client
+    return _http_client
+
+def close_http_pool() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
 def get_supabase_client() -> Client:
     """
     Get the Supabase client instance.
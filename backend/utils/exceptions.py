@@ -4,17 +4,23 @@ Custom exception classes for the application.
 from fastapi import HTTPException, status
 
 
-class ProjectNotFoundException(HTTPException):
+class BaseAPIException(HTTPException):
+    """Base class for application exceptions returned as {"detail": ...}."""
+
+
+class ProjectNotFoundException(BaseAPIException):
     """Exception raised when a project is not found."""
     
+    _TEMPLATE = "Project with id '%s' not found"
+    
     def __init__(self, project_id: str):
         super().__init__(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Project with id '{project_id}' not found"
+            detail=self._TEMPLATE % project_id
         )
 
 
-class UnauthorizedAccessException(HTTPException):
+class UnauthorizedAccessException(BaseAPIException):
     """Exception raised when user tries to access unauthorized resource."""
     
     def __init__(self, message: str = "You don't have permission to access this resource"):
@@ -24,7 +30,7 @@ class UnauthorizedAccessException(HTTPException):
         )
 
 
-class InvalidDataException(HTTPException):
+class InvalidDataException(BaseAPIException):
     """Exception raised when invalid data is provided."""
     
     def __init__(self, message: str = "Invalid data provided"):
@@ -34,17 +40,19 @@ class InvalidDataException(HTTPException):
         )
 
 
-class TaskNotFoundException(HTTPException):
+class TaskNotFoundException(BaseAPIException):
     """Exception raised when a task is not found."""
     
+    _TEMPLATE = "Task with id '%s' not found"
+    
     def __init__(self, task_id: str):
         super().__init__(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Task with id '{task_id}' not found"
+            detail=self._TEMPLATE % task_id
         )
 
 
-class TeamMemberNotFoundException(HTTPException):
+class TeamMemberNotFoundException(BaseAPIException):
     """Exception raised when a team member is not found."""
     
     def __init__(self, message: str = "Team member not found"):
@@ -54,7 +62,7 @@ class TeamMemberNotFoundException(HTTPException):
         )
 
 
-class DatabaseException(HTTPException):
+class DatabaseException(BaseAPIException):
     """Exception raised when a database operation fails."""
     
     def __init__(self, message: str = "Database operation failed"):
@@ -64,7 +72,7 @@ class DatabaseException(HTTPException):
         )
 
 
-class DuplicateEntryException(HTTPException):
+class DuplicateEntryException(BaseAPIException):
     """Exception raised when trying to create a duplicate entry."""
     
     def __init__(self, message: str = "Entry already exists"):
@@ -74,27 +82,32 @@ class DuplicateEntryException(HTTPException):
         )
 
 
-class MemberAlreadyExistsException(HTTPException):
+class MemberAlreadyExistsException(BaseAPIException):
     """Exception raised when trying to add an existing team member."""
     
+    _TEMPLATE = "User '%s' is already a member of this project"
+    
     def __init__(self, username: str):
         super().__init__(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"User '{username}' is already a member of this project"
+            detail=self._TEMPLATE % username
         )
 
 
-class InvalidRoleException(HTTPException):
+class InvalidRoleException(BaseAPIException):
     """Exception raised when an invalid role is provided."""
     
+    _ALLOWED = "owner, manager, developer, viewer"
+    _TEMPLATE = "Invalid role '%s'. Must be one of: " + _ALLOWED
+    
     def __init__(self, role: str):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role '{role}'. Must be one of: owner, manager, developer, viewer"
+            detail=self._TEMPLATE % role
         )
 
 
-class CannotRemoveOwnerException(HTTPException):
+class CannotRemoveOwnerException(BaseAPIException):
     """Exception raised when trying to remove the project owner."""
     
     def __init__(self):
@@ -104,17 +117,29 @@ class CannotRemoveOwnerException(HTTPException):
         )
 
 
-class UserNotFoundException(HTTPException):
+class UserNotFoundException(BaseAPIException):
     """Exception raised when a user is not found."""
     
+    _TEMPLATE = "User '%s' not found"
+    
     def __init__(self, username: str):
         super().__init__(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User '{username}' not found"
+            detail=self._TEMPLATE % username
+        )
+
+
+class PreconditionFailedException(BaseAPIException):
+    """Exception raised when a conditional update finds the record has changed."""
+    
+    def __init__(self, message: str = "The resource was modified since it was last read"):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=message
         )
 
 
-class InsufficientPermissionsException(HTTPException):
+class InsufficientPermissionsException(BaseAPIException):
     """Exception raised when user lacks required permissions."""
     
     def __init__(self, action: str = "perform this action"):
@@ -1,10 +1,16 @@
 """
 Helper functions for various operations.
 """
+import re
+from collections import Counter
 from datetime import datetime
 from typing import Optional
 from utils.supabase_client import get_db, SupabaseDB
 
+# Compiled once at import for validate_username/validate_email
+_USERNAME_RE = re.compile(r"^[A-Za-z0-9_]{3,50}$")
+_EMAIL_RE = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+
 
 async def log_task_assignment(
     task_id: str,
@@ -30,7 +36,11 @@ async def log_task_assignment(
     # You could create an "activity_log" or "task_assignments" table to track this
     # For now, we'll just pass - the assignment is stored in the task itself
     
-    # Future enhancement: Store in activity_log table
+    # Future enhancement: Store in activity_log table.
+    # Write the log row in the same statement as the task insert/update
+    # (a writable CTE inside a SQL function called via db.rpc, like
+    # update_task_with_progress) rather than as a second insert here, so
+    # the task and its log row commit together in one round-trip.
     # activity_data = {
     #     "project_id": project_id,
     #     "task_id": task_id,
@@ -128,33 +138,6 @@ def format_project_summary(project: dict) -> str:
     return f"Project '{name}' [{status}] - {progress}% complete, Owner: {owner}"
 
 
-async def calculate_project_progress(project_id: str) -> int:
-    """
-    Calculate project progress based on completed tasks.
-    
-    Args:
-        project_id: UUID of the project
-        
-    Returns:
-        Progress percentage (0-100)
-    """
-    db: SupabaseDB = get_db()
-    
-    # Get all tasks for the project
-    tasks = await db.select_where("tasks", "project_id", project_id)
-    
-    if not tasks or len(tasks) == 0:
-        return 0
-    
-    # Count completed tasks
-    completed = sum(1 for task in tasks if task.get("status") == "completed")
-    
-    # Calculate percentage
-    progress = int((completed / len(tasks)) * 100)
-    
-    return progress
-
-
 async def get_user_task_count(username: str, project_id: Optional[str] = None) -> dict:
     """
     Get task count for a user.
@@ -173,18 +156,20 @@ async def get_user_task_count(username: str, project_id: Optional[str] = None) -
         # Filter by both username and project
         tasks = await db.select_with_filters(
             "tasks",
-            {"assigned_to": username, "project_id": project_id}
+            {"assigned_to": username, "project_id": project_id},
+            columns="status"
         )
     else:
         # All tasks for user across all projects
-        tasks = await db.select_where("tasks", "assigned_to", username)
+        tasks = await db.select_where("tasks", "assigned_to", username, columns="status")
     
-    # Count by status
+    # Count by status in a single pass
+    status_counts = Counter(t.get("status") for t in tasks)
     counts = {
         "total": len(tasks),
-        "todo": sum(1 for t in tasks if t.get("status") == "todo"),
-        "in_progress": sum(1 for t in tasks if t.get("status") == "in_progress"),
-        "completed": sum(1 for t in tasks if t.get("status") == "completed")
+        "todo": status_counts["todo"],
+        "in_progress": status_counts["in_progress"],
+        "completed": status_counts["completed"]
     }
     
     return counts
@@ -219,12 +204,12 @@ def validate_username(username: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # Basic validation
+    # Cheap length reject before running the regex
     if not username or len(username) < 3 or len(username) > 50:
         return False
     
-    # Could add more validation (alphanumeric, special chars, etc.)
-    return True
+    # Letters, digits and underscores only
+    return _USERNAME_RE.match(username) is not None
 
 
 def validate_email(email: str) -> bool:
@@ -237,9 +222,10 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    # Basic validation (Pydantic handles this better)
-    if not email or "@" not in email or "." not in email:
+    # Cheap reject before running the regex (shortest match is "a@b.c")
+    if not email or len(email) < 5:
         return False
     
-    return True
+    # One "@" with a dotted domain and no whitespace (Pydantic's EmailStr is stricter)
+    return _EMAIL_RE.match(email) is not None
 
@@ -1,13 +1,27 @@
 """
 Middleware and dependency functions for authentication and authorization.
 """
-from typing import Optional, List, Callable
-from fastapi import Header, HTTPException, status, Path
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, List, Callable
+from fastapi import Header, HTTPException, Request, status, Path
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Depends
 
 from models.auth import User, UserResponse
-from utils.supabase_auth import verify_token
+from utils.supabase_auth import verify_token, user_to_response
+from utils.permissions import (
+    get_project_context,
+    get_user_role_in_project,
+    is_project_member,
+    check_permission,
+    Permission,
+)
+from utils.exceptions import (
+    ProjectNotFoundException,
+    UnauthorizedAccessException,
+    InsufficientPermissionsException,
+)
 
 
 # Define security scheme
@@ -59,7 +73,7 @@ async def verify_auth_token(token: str = Depends(get_token_from_header)) -> User
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    is_valid, message, user = verify_token(token)
+    is_valid, message, user = await asyncio.to_thread(verify_token, token)
     
     if not is_valid or not user:
         raise HTTPException(
@@ -69,15 +83,21 @@ async def verify_auth_token(token: str = Depends(get_token_from_header)) -> User
         )
     
     # Convert User to UserResponse
-    from utils.supabase_auth import user_to_response
     return user_to_response(user)
 
 
-async def get_current_user(token: str = Depends(get_token_from_header)) -> User:
+async def get_current_user(
+    request: Request,
+    token: str = Depends(get_token_from_header)
+) -> User:
     """
     Get the current authenticated user (full User object).
     
+    The verified user is stored on request.state, so the token is only
+    checked once per request even if several dependencies need the user.
+    
     Args:
+        request: Current request
         token: Authentication token from header
         
     Returns:
@@ -86,7 +106,11 @@ async def get_current_user(token: str = Depends(get_token_from_header)) -> User:
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    is_valid, message, user = verify_token(token)
+    user = get_cached_user(request)
+    if user is not None:
+        return user
+    
+    is_valid, message, user = await asyncio.to_thread(verify_token, token)
     
     if not is_valid or not user:
         raise HTTPException(
@@ -95,9 +119,72 @@ async def get_current_user(token: str = Depends(get_token_from_header)) -> User:
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    request.state.current_user = user
     return user
 
 
+def get_cached_user(request: Request) -> Optional[User]:
+    """
+    Get the user already verified for this request, without re-checking the token.
+    
+    Args:
+        request: Current request
+        
+    Returns:
+        User object if get_current_user has run for this request, None otherwise
+    """
+    return getattr(request.state, "current_user", None)
+
+
+@dataclass(frozen=True)
+class ProjectContext:
+    """Project, authenticated user and the user's role in the project."""
+    project: Dict[str, Any]
+    role: str
+    user: User
+
+
+async def get_project_ctx(
+    project_id: str = Path(...),
+    current_user: User = Depends(get_current_user)
+) -> ProjectContext:
+    """
+    Resolve the project and the current user's role for a project endpoint.
+    
+    The project and role are loaded in one query, and FastAPI caches the
+    dependency for the request, so the handler and any sub-dependencies
+    share a single lookup.
+    
+    Usage:
+        @router.put("/projects/{project_id}/tasks/{task_id}")
+        async def update_task(
+            project_id: str,
+            task_id: str,
+            ctx: ProjectContext = Depends(get_project_ctx)
+        ):
+            ...
+    
+    Args:
+        project_id: Project UUID from the path
+        current_user: Authenticated user
+        
+    Returns:
+        ProjectContext for the request
+        
+    Raises:
+        ProjectNotFoundException: If project doesn't exist
+        UnauthorizedAccessException: If user isn't the owner or a team member
+    """
+    project, role = await get_project_context(project_id, current_user.username)
+    if not project:
+        raise ProjectNotFoundException(project_id)
+    
+    if role is None:
+        raise UnauthorizedAccessException("You don't have access to this project")
+    
+    return ProjectContext(project=project, role=role, user=current_user)
+
+
 async def optional_auth(authorization: Optional[str] = Header(None)) -> Optional[UserResponse]:
     """
     Optional authentication - returns user if authenticated, None otherwise.
@@ -118,10 +205,9 @@ async def optional_auth(authorization: Optional[str] = Header(None)) -> Optional
             return None
         
         token = parts[1]
-        is_valid, message, user = verify_token(token)
+        is_valid, message, user = await asyncio.to_thread(verify_token, token)
         
         if is_valid and user:
-            from utils.supabase_auth import user_to_response
             return user_to_response(user)
     except Exception:
         pass
@@ -152,9 +238,6 @@ def require_role(required_roles: List[str]) -> Callable:
         project_id: str = Path(...),
         current_user: User = Depends(get_current_user)
     ) -> None:
-        from utils.permissions import get_user_role_in_project
-        from utils.exceptions import InsufficientPermissionsException
-        
         # Get user's role in this project
         user_role = await get_user_role_in_project(current_user.username, project_id)
         
@@ -207,9 +290,6 @@ def require_project_member() -> Callable:
         project_id: str = Path(...),
         current_user: User = Depends(get_current_user)
     ) -> None:
-        from utils.permissions import is_project_member
-        from utils.exceptions import UnauthorizedAccessException
-        
         # Check if user is a member
         if not await is_project_member(current_user.username, project_id):
             raise UnauthorizedAccessException(
@@ -244,9 +324,6 @@ def require_permission(permission: str) -> Callable:
         project_id: str = Path(...),
         current_user: User = Depends(get_current_user)
     ) -> None:
-        from utils.permissions import get_user_role_in_project, check_permission, Permission
-        from utils.exceptions import InsufficientPermissionsException
-        
         # Get user's role in this project
         user_role = await get_user_role_in_project(current_user.username, project_id)
         
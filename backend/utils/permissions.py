@@ -1,10 +1,15 @@
 """
 Role-based access control (RBAC) system for project permissions.
 """
-from typing import List, Optional
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from enum import Enum
 
 from utils.supabase_client import get_db, SupabaseDB
+from utils.request_cache import request_cache
+from utils import cache
 
 
 class Permission(str, Enum):
@@ -93,35 +98,247 @@ ROLE_PERMISSIONS = {
     ],
 }
 
+# Precomputed bitmasks so permission checks are a single AND
+_PERMISSION_BITS: Dict[str, int] = {perm.value: 1 << i for i, perm in enumerate(Permission)}
+_ROLE_MASKS: Dict[str, int] = {
+    role.value: sum(_PERMISSION_BITS[perm.value] for perm in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
 
-async def get_user_role_in_project(username: str, project_id: str) -> Optional[str]:
+
+async def get_project_cached(project_id: str) -> Optional[Dict[str, Any]]:
     """
-    Get the role of a user in a specific project.
+    Get a project record, reusing it if already loaded during this request.
+    
+    Lookup order: request cache, Redis cache, database.
     
     Args:
-        username: Username to check
         project_id: Project UUID
         
     Returns:
-        Role string (owner, manager, developer, viewer) or None if not a member
+        Project dictionary or None if not found
+    """
+    projects = request_cache("projects")
+    if projects is not None and project_id in projects:
+        return projects[project_id]
+    
+    project, gen = await cache.get_cached_project(project_id)
+    if project is cache.MISS:
+        db: SupabaseDB = get_db()
+        project = await db.select_by_id("projects", project_id)
+        if project is not None:
+            # Stored under the generation read before the query, so it is
+            # never served if the project was invalidated in the meantime
+            await cache.set_cached_project(project_id, project, gen)
+    
+    if projects is not None:
+        projects[project_id] = project
+    return project
+
+
+async def get_project_context(
+    project_id: str,
+    username: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Get a project and a user's role in it with one query.
+    
+    Lookup order: request cache, Redis cache, then the project_context SQL
+    function. Both results seed the request cache, so later
+    is_project_owner / is_project_member / get_user_role_in_project calls
+    for this user don't query again.
+    
+    Args:
+        project_id: Project UUID
+        username: Username to check
+        
+    Returns:
+        Tuple of (project dictionary or None, role string or None)
+    """
+    projects = request_cache("projects")
+    roles = request_cache("roles")
+    key = (username, project_id)
+    if projects is not None and roles is not None and project_id in projects and key in roles:
+        return projects[project_id], roles[key]
+    
+    (project, project_gen), (role, role_gen) = await asyncio.gather(
+        cache.get_cached_project(project_id),
+        cache.get_cached_role(project_id, username)
+    )
+    if project is cache.MISS or role is cache.MISS:
+        db: SupabaseDB = get_db()
+        rows = await db.rpc("project_context", {"pid": project_id, "uname": username})
+        
+        project, role = None, None
+        if rows:
+            project = dict(rows[0])
+            role = project.pop("role")
+            # Written under the generations read before the query, so an
+            # invalidation that ran in between leaves them unused
+            await asyncio.gather(
+                cache.set_cached_project(project_id, project, project_gen),
+                cache.set_cached_role(project_id, username, role, role_gen)
+            )
+    
+    if projects is not None:
+        projects[project_id] = project
+    if roles is not None:
+        roles[key] = role
+    return project, role
+
+
+async def get_user_projects(username: str) -> List[Dict[str, Any]]:
+    """
+    Get every project a user owns or is a team member of, in one query.
+    
+    Uses the user_projects SQL function. Each record carries the user's
+    "role", which also seeds the request's role cache. Owned projects come
+    first, then team projects, each group in creation order.
+    
+    Args:
+        username: Username to look up
+        
+    Returns:
+        List of project dictionaries with an extra "role" key
     """
     db: SupabaseDB = get_db()
+    projects = await db.rpc("user_projects", {"uname": username})
+    
+    roles = request_cache("roles")
+    if roles is not None:
+        for project in projects:
+            roles[(username, project["id"])] = project["role"]
     
-    # Check if user is the project owner
-    project = await db.select_by_id("projects", project_id)
-    if project and project.get("owner_id") == username:
-        return Role.OWNER
+    return projects
+
+
+async def _load_user_roles(username: str, project_ids: List[str]) -> Dict[str, Optional[str]]:
+    """Resolve a user's role in several projects from the database in one batch."""
+    db: SupabaseDB = get_db()
     
-    # Check if user is a team member
-    team_members = await db.select_with_filters(
-        "team_members",
-        {"project_id": project_id, "username": username}
+    # Ownership and membership for all projects, queried concurrently
+    owned, memberships = await asyncio.gather(
+        db.select_in("projects", "id", project_ids, columns="id", filters={"owner_id": username}),
+        db.select_in(
+            "team_members", "project_id", project_ids,
+            columns="project_id, role", filters={"username": username}
+        )
     )
     
-    if team_members and len(team_members) > 0:
-        return team_members[0].get("role")
+    roles: Dict[str, Optional[str]] = {m["project_id"]: m.get("role") for m in memberships}
+    for project in owned:
+        roles[project["id"]] = Role.OWNER
+    return roles
+
+
+class RoleLoader:
+    """
+    Batches role lookups made in the same event-loop tick.
+    
+    Every load() issued before the loop gets back to the dispatch callback
+    is resolved by a single _load_user_roles call per username, with the
+    usernames of one batch loaded concurrently.
+    """
+    
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        # The event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def load(self, username: str, project_id: str) -> asyncio.Future:
+        """
+        Queue a role lookup.
+        
+        Args:
+            username: Username to check
+            project_id: Project UUID
+            
+        Returns:
+            Future resolving to the role string or None
+        """
+        key = (username, project_id)
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._start_dispatch)
+            future = self._pending[key] = loop.create_future()
+        return future
+    
+    def _start_dispatch(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        
+        project_ids_by_user: Dict[str, List[str]] = defaultdict(list)
+        for username, project_id in batch:
+            project_ids_by_user[username].append(project_id)
+        
+        await asyncio.gather(*(
+            self._resolve(username, project_ids, batch)
+            for username, project_ids in project_ids_by_user.items()
+        ))
+    
+    @staticmethod
+    async def _resolve(
+        username: str,
+        project_ids: List[str],
+        batch: Dict[Tuple[str, str], asyncio.Future]
+    ) -> None:
+        # Waiters may have been cancelled (e.g. client disconnected), so
+        # done futures are skipped rather than resolved a second time
+        futures = [batch[(username, project_id)] for project_id in project_ids]
+        try:
+            roles = await _load_user_roles(username, project_ids)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for project_id, future in zip(project_ids, futures):
+            if not future.done():
+                future.set_result(roles.get(project_id))
+
+
+def _role_loader() -> RoleLoader:
+    """Get the current request's RoleLoader (a fresh one outside a request)."""
+    loaders = request_cache("loaders")
+    if loaders is None:
+        return RoleLoader()
+    return loaders.setdefault("roles", RoleLoader())
+
+
+async def get_user_role_in_project(username: str, project_id: str) -> Optional[str]:
+    """
+    Get the role of a user in a specific project.
+    
+    Results are cached for the rest of the current request and in Redis.
+    Concurrent cache misses within a request share one database query.
+    
+    Args:
+        username: Username to check
+        project_id: Project UUID
+        
+    Returns:
+        Role string (owner, manager, developer, viewer) or None if not a member
+    """
+    roles = request_cache("roles")
+    key = (username, project_id)
+    if roles is not None and key in roles:
+        return roles[key]
+    
+    role, gen = await cache.get_cached_role(project_id, username)
+    if role is cache.MISS:
+        role = await _role_loader().load(username, project_id)
+        await cache.set_cached_role(project_id, username, role, gen)
     
-    return None
+    if roles is not None:
+        roles[key] = role
+    return role
 
 
 def check_permission(user_role: str, required_permission: Permission) -> bool:
@@ -138,12 +355,8 @@ def check_permission(user_role: str, required_permission: Permission) -> bool:
     if not user_role:
         return False
     
-    try:
-        role_enum = Role(user_role.lower())
-        permissions = ROLE_PERMISSIONS.get(role_enum, [])
-        return required_permission in permissions
-    except ValueError:
-        return False
+    role_mask = _ROLE_MASKS.get(user_role.lower(), 0)
+    return role_mask & _PERMISSION_BITS.get(required_permission, 0) != 0
 
 
 def has_any_permission(user_role: str, required_permissions: List[Permission]) -> bool:
@@ -185,8 +398,7 @@ async def is_project_owner(username: str, project_id: str) -> bool:
     Returns:
         True if user is owner, False otherwise
     """
-    db: SupabaseDB = get_db()
-    project = await db.select_by_id("projects", project_id)
+    project = await get_project_cached(project_id)
     return project is not None and project.get("owner_id") == username
 
 
@@ -293,6 +505,7 @@ async def can_manage_team(username: str, project_id: str) -> bool:
     return check_permission(role, Permission.MANAGE_TEAM)
 
 
+@lru_cache(maxsize=None)
 def get_role_permissions(role: str) -> List[Permission]:
     """
     Get all permissions for a role.
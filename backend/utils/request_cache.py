@@ -0,0 +1,45 @@
+"""
+Request-scoped cache for lookups repeated within a single request.
+"""
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# Per-request storage; None outside of an HTTP request
+_request_cache: ContextVar[Optional[Dict[str, Dict[Any, Any]]]] = ContextVar(
+    "request_cache", default=None
+)
+
+
+def request_cache(namespace: str) -> Optional[Dict[Any, Any]]:
+    """
+    Get the current request's cache dictionary for a namespace.
+    
+    Args:
+        namespace: Cache namespace (e.g. "roles", "projects")
+    
+    Returns:
+        Mutable dictionary shared for the rest of the request,
+        or None when called outside of a request
+    """
+    cache = _request_cache.get()
+    if cache is None:
+        return None
+    return cache.setdefault(namespace, {})
+
+
+class RequestCacheMiddleware:
+    """ASGI middleware that gives every HTTP request a fresh, empty cache."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = _request_cache.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_cache.reset(token)
@@ -2,10 +2,11 @@
 Supabase-based authentication system for persistent user storage.
 """
 import hashlib
+import hmac
 import secrets
 from datetime import datetime
 from typing import Optional, Tuple
-from models.auth import User, UserSignup, UserLogin, TokenResponse, UserResponse
+from models.auth import User, UserSignup, UserLogin, TokenResponse, UserResponse, utc_now
 from utils.config import get_supabase_client
 
 
@@ -20,7 +21,8 @@ def verify_password(password: str, hashed_password: str) -> bool:
     """Verify password against hash."""
     try:
         salt, password_hash = hashed_password.split(':')
-        return hashlib.sha256((password + salt).encode()).hexdigest() == password_hash
+        candidate = hashlib.sha256((password + salt).encode()).hexdigest()
+        return hmac.compare_digest(candidate.encode(), password_hash.encode())
     except ValueError:
         return False
 
@@ -72,12 +74,16 @@ def signup(signup_data: UserSignup) -> Tuple[bool, str, Optional[TokenResponse]]
         user_id = generate_user_id()
         hashed_password = hash_password(signup_data.password)
         
+        # One timestamp for the user row, the User object and the token row
+        now = utc_now()
+        created_at = now.isoformat()
+        
         new_user_data = {
             'id': user_id,
             'username': signup_data.username,
             'password': hashed_password,
             'email': signup_data.email,
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at
         }
         
         # Insert user into Supabase
@@ -92,7 +98,7 @@ def signup(signup_data: UserSignup) -> Tuple[bool, str, Optional[TokenResponse]]
             username=signup_data.username,
             password=hashed_password,
             email=signup_data.email,
-            created_at=datetime.now()
+            created_at=now
         )
         
         # Generate token
@@ -102,7 +108,7 @@ def signup(signup_data: UserSignup) -> Tuple[bool, str, Optional[TokenResponse]]
         token_data = {
             'token': token,
             'username': signup_data.username,
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at
         }
         
         supabase.table('auth_tokens').insert(token_data).execute()
@@ -160,7 +166,7 @@ def login(login_data: UserLogin) -> Tuple[bool, str, Optional[TokenResponse]]:
         token_data = {
             'token': token,
             'username': user.username,
-            'created_at': datetime.now().isoformat()
+            'created_at': utc_now().isoformat()
         }
         
         supabase.table('auth_tokens').insert(token_data).execute()
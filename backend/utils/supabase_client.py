@@ -1,10 +1,20 @@
 """
 Supabase database wrapper class for common operations.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from supabase import Client
-from utils.config import get_supabase_client
-from utils.exceptions import DatabaseException
+from utils.config import get_supabase_client, SUPABASE_MAX_CONNECTIONS
+from utils.exceptions import DatabaseException, DuplicateEntryException
+
+
+# One worker per pooled HTTP connection. asyncio's default executor stops at
+# min(32, cpu_count + 4) threads, which would leave most of the pool idle.
+_executor = ThreadPoolExecutor(
+    max_workers=SUPABASE_MAX_CONNECTIONS,
+    thread_name_prefix="supabase"
+)
 
 
 class SupabaseDB:
@@ -14,6 +24,25 @@ class SupabaseDB:
         """Initialize Supabase client."""
         self.client: Client = get_supabase_client()
     
+    @staticmethod
+    async def _execute(query) -> Any:
+        """
+        Execute a PostgREST query in a worker thread.
+        
+        The supabase-py client is synchronous; running it off the event loop
+        lets concurrent requests (and asyncio.gather fan-outs) overlap their
+        round-trips instead of blocking each other. The dedicated executor
+        is sized to the HTTP connection pool.
+        
+        Args:
+            query: Built query exposing execute()
+            
+        Returns:
+            The query response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, query.execute)
+    
     async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Insert a new record into a table.
@@ -29,7 +58,7 @@ class SupabaseDB:
             DatabaseException: If insert fails
         """
         try:
-            response = self.client.table(table).insert(data).execute()
+            response = await self._execute(self.client.table(table).insert(data))
             if response.data and len(response.data) > 0:
                 return response.data[0]
             raise DatabaseException(f"Failed to insert record into {table}")
@@ -38,6 +67,36 @@ class SupabaseDB:
                 raise DatabaseException(f"Duplicate entry in {table}")
             raise DatabaseException(f"Insert failed: {str(e)}")
     
+    async def insert_many(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert several records into a table with a single request.
+        
+        Args:
+            table: Table name
+            rows: List of column:value dictionaries
+            
+        Returns:
+            Inserted records with generated fields
+            
+        Raises:
+            DuplicateEntryException: If a row violates a unique constraint
+                (nothing is inserted)
+            DatabaseException: If insert fails
+        """
+        if not rows:
+            return []
+        try:
+            response = await self._execute(self.client.table(table).insert(rows))
+            if response.data and len(response.data) == len(rows):
+                return response.data
+            raise DatabaseException(f"Failed to insert records into {table}")
+        except DatabaseException:
+            raise
+        except Exception as e:
+            if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+                raise DuplicateEntryException(f"Duplicate entry in {table}")
+            raise DatabaseException(f"Insert failed: {str(e)}")
+    
     async def update(self, table: str, record_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update a record in a table by ID.
@@ -54,7 +113,7 @@ class SupabaseDB:
             DatabaseException: If update fails
         """
         try:
-            response = self.client.table(table).update(data).eq('id', record_id).execute()
+            response = await self._execute(self.client.table(table).update(data).eq('id', record_id))
             if response.data and len(response.data) > 0:
                 return response.data[0]
             raise DatabaseException(f"Record with id '{record_id}' not found in {table}")
@@ -76,11 +135,82 @@ class SupabaseDB:
             DatabaseException: If delete fails
         """
         try:
-            response = self.client.table(table).delete().eq('id', record_id).execute()
+            response = await self._execute(self.client.table(table).delete().eq('id', record_id))
             return True
         except Exception as e:
             raise DatabaseException(f"Delete failed: {str(e)}")
     
+    async def upsert(self, table: str, data: Dict[str, Any], on_conflict: List[str]) -> Dict[str, Any]:
+        """
+        Insert a record, or update the existing one that conflicts with it.
+        
+        Args:
+            table: Table name
+            data: Dictionary of column:value pairs
+            on_conflict: Columns of the unique constraint to resolve on
+            
+        Returns:
+            Inserted or updated record
+            
+        Raises:
+            DatabaseException: If upsert fails
+        """
+        try:
+            response = await self._execute(
+                self.client.table(table).upsert(data, on_conflict=",".join(on_conflict))
+            )
+            if response.data and len(response.data) > 0:
+                return response.data[0]
+            raise DatabaseException(f"Failed to upsert record into {table}")
+        except Exception as e:
+            raise DatabaseException(f"Upsert failed: {str(e)}")
+    
+    async def update_where(
+        self,
+        table: str,
+        filters: Dict[str, Any],
+        data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Update all records matching equality filters in one statement.
+        
+        Args:
+            table: Table name
+            filters: Dictionary of column:value pairs to match
+            data: Dictionary of fields to update
+            
+        Returns:
+            Updated records (empty if nothing matched)
+            
+        Raises:
+            DatabaseException: If update fails
+        """
+        try:
+            response = await self._execute(self.client.table(table).update(data).match(filters))
+            return response.data if response.data else []
+        except Exception as e:
+            raise DatabaseException(f"Update failed: {str(e)}")
+    
+    async def delete_where(self, table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Delete all records matching equality filters in one statement.
+        
+        Args:
+            table: Table name
+            filters: Dictionary of column:value pairs to match
+            
+        Returns:
+            Deleted records (empty if nothing matched)
+            
+        Raises:
+            DatabaseException: If delete fails
+        """
+        try:
+            response = await self._execute(self.client.table(table).delete().match(filters))
+            return response.data if response.data else []
+        except Exception as e:
+            raise DatabaseException(f"Delete failed: {str(e)}")
+    
     async def select(self, table: str, columns: str = "*") -> List[Dict[str, Any]]:
         """
         Select all records from a table.
@@ -96,7 +226,7 @@ class SupabaseDB:
             DatabaseException: If select fails
         """
         try:
-            response = self.client.table(table).select(columns).execute()
+            response = await self._execute(self.client.table(table).select(columns))
             return response.data if response.data else []
         except Exception as e:
             raise DatabaseException(f"Select failed: {str(e)}")
@@ -117,7 +247,41 @@ class SupabaseDB:
             DatabaseException: If select fails
         """
         try:
-            response = self.client.table(table).select(columns).eq('id', record_id).execute()
+            response = await self._execute(self.client.table(table).select(columns).eq('id', record_id))
+            if response.data and len(response.data) > 0:
+                return response.data[0]
+            return None
+        except Exception as e:
+            raise DatabaseException(f"Select by ID failed: {str(e)}")
+    
+    async def select_by_id_scoped(
+        self,
+        table: str,
+        record_id: str,
+        scope_column: str,
+        scope_value: Any,
+        columns: str = "*"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Select a single record by ID, only if it also matches a scope column.
+        
+        Args:
+            table: Table name
+            record_id: Record UUID
+            scope_column: Column the record must match (e.g. "project_id")
+            scope_value: Required value of scope_column
+            columns: Columns to select (default: all)
+            
+        Returns:
+            Record dictionary, or None if not found or out of scope
+            
+        Raises:
+            DatabaseException: If select fails
+        """
+        try:
+            response = await self._execute(
+                self.client.table(table).select(columns).eq('id', record_id).eq(scope_column, scope_value)
+            )
             if response.data and len(response.data) > 0:
                 return response.data[0]
             return None
@@ -147,11 +311,61 @@ class SupabaseDB:
             DatabaseException: If select fails
         """
         try:
-            response = self.client.table(table).select(columns).eq(column, value).execute()
+            response = await self._execute(self.client.table(table).select(columns).eq(column, value))
             return response.data if response.data else []
         except Exception as e:
             raise DatabaseException(f"Select where failed: {str(e)}")
     
+    async def select_in(
+        self,
+        table: str,
+        column: str,
+        values: List[Any],
+        columns: str = "*",
+        order_by: Optional[str] = None,
+        ascending: bool = True,
+        limit: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select records where column matches any of the given values.
+        
+        Args:
+            table: Table name
+            column: Column name to filter
+            values: Values to match (one IN (...) query for all of them)
+            columns: Columns to select (default: all)
+            order_by: Column to order by (optional)
+            ascending: Sort order (default: True)
+            limit: Maximum number of records to return (optional)
+            filters: Additional column:value equality filters (optional)
+            
+        Returns:
+            List of matching records
+            
+        Raises:
+            DatabaseException: If select fails
+        """
+        if not values:
+            return []
+        try:
+            query = self.client.table(table).select(columns).in_(column, list(values))
+            
+            if filters:
+                for filter_column, value in filters.items():
+                    query = query.eq(filter_column, value)
+            
+            # Sort and limit in the database so only the needed rows are returned
+            if order_by:
+                query = query.order(order_by, desc=not ascending)
+            if limit is not None:
+                query = query.limit(limit)
+            
+            response = await self._execute(query)
+            return response.data if response.data else []
+        except Exception as e:
+            raise DatabaseException(f"Select in failed: {str(e)}")
+    
     async def select_with_filters(
         self,
         table: str,
@@ -187,7 +401,7 @@ class SupabaseDB:
             if order_by:
                 query = query.order(order_by, desc=not ascending)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.data if response.data else []
         except Exception as e:
             raise DatabaseException(f"Select with filters failed: {str(e)}")
@@ -207,25 +421,26 @@ class SupabaseDB:
             DatabaseException: If count fails
         """
         try:
-            response = self.client.table(table).select(column, count="exact").execute()
+            response = await self._execute(self.client.table(table).select(column, count="exact"))
             return response.count if hasattr(response, 'count') else len(response.data)
         except Exception as e:
             raise DatabaseException(f"Count failed: {str(e)}")
     
-    async def exists(self, table: str, column: str, value: Any) -> bool:
+    async def exists(self, table: str, filters: Dict[str, Any]) -> bool:
         """
-        Check if a record exists with the given column value.
+        Check if a record exists matching all the given column values.
+        
+        Fetches at most one id, so the response size is constant.
         
         Args:
             table: Table name
-            column: Column name
-            value: Value to check
+            filters: Dictionary of column:value pairs to match
             
         Returns:
             True if exists, False otherwise
         """
         try:
-            response = self.client.table(table).select("id").eq(column, value).limit(1).execute()
+            response = await self._execute(self.client.table(table).select("id").match(filters).limit(1))
             return response.data is not None and len(response.data) > 0
         except Exception:
             return False
@@ -252,7 +467,7 @@ class SupabaseDB:
                 for column, value in where_clause.items():
                     query = query.eq(column, value)
             
-            response = query.execute()
+            response = await self._execute(query)
             return response.count if hasattr(response, 'count') else len(response.data)
         except Exception as e:
             raise DatabaseException(f"Count records failed: {str(e)}")
@@ -292,7 +507,7 @@ class SupabaseDB:
                 for column, value in where_clause.items():
                     query = query.eq(column, value)
             
-            response = query.execute()
+            response = await self._execute(query)
             data = response.data if response.data else []
             
             # Perform aggregation in Python
@@ -366,11 +581,32 @@ class SupabaseDB:
             # Example: select="*, projects(*)" to get related project data
             select_str = f"{select_columns}, {join_table}(*)"
             
-            response = self.client.table(main_table).select(select_str).execute()
+            response = await self._execute(self.client.table(main_table).select(select_str))
             return response.data if response.data else []
         except Exception as e:
             raise DatabaseException(f"Join query failed: {str(e)}")
     
+    async def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a Postgres function exposed through PostgREST.
+        
+        Args:
+            function: Function name
+            params: Named function arguments
+            
+        Returns:
+            List of rows for set-returning functions, otherwise the
+            function's (JSON) value
+            
+        Raises:
+            DatabaseException: If the call fails
+        """
+        try:
+            response = await self._execute(self.client.rpc(function, params or {}))
+            return response.data if response.data else []
+        except Exception as e:
+            raise DatabaseException(f"RPC {function} failed: {str(e)}")
+    
     async def custom_query(self, query_func) -> Any:
         """
         Execute a custom query function.
@@ -407,3 +643,7 @@ def get_db() -> SupabaseDB:
         _db_instance = SupabaseDB()
     return _db_instance
 
+
+def shutdown_db_executor() -> None:
+    """Stop the database worker threads."""
+    _executor.shutdown(wait=False, cancel_futures=True)